@@ -110,13 +110,18 @@ class Logger:
         return logger
     
     @staticmethod
-    def setup_from_config(app_name: str, config: Any) -> logging.Logger:
+    def setup_from_config(
+        app_name: str,
+        config: Any,
+        additional_loggers: Dict[str, str] = None
+    ) -> logging.Logger:
         """
         Set up logging using configuration from a Config object.
         
         Args:
             app_name: Name of the application
             config: Configuration object with logging settings
+            additional_loggers: Dict of logger names and their levels to configure
             
         Returns:
             The configured logger
@@ -134,5 +139,6 @@ class Logger:
             file_format=file_config.format,
             date_format=console_config.date_format,
             max_bytes=file_config.max_bytes,
-            backup_count=file_config.backup_count
+            backup_count=file_config.backup_count,
+            additional_loggers=additional_loggers
         ) 
\ No newline at end of file
@@ -1,8 +1,9 @@
-import json
 import os
 import logging
-import logging.handlers
-import colorlog
+import orjson
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 from pydantic import BaseModel
 from typing import Optional
 
@@ -30,17 +31,20 @@ class ConfigModel(BaseModel):
     poll_interval: int = 3600  # Default to 1 hour
     base_url: str = "http://localhost:5000"  # Default to localhost
 
-class FlaskFilter(logging.Filter):
-    def filter(self, record):
-        return True
+@lru_cache(maxsize=None)
+def load_config_file(config_path: str) -> MappingProxyType:
+    """Read and parse a JSON config file once per process.
 
-class ColoredFlaskFilter(logging.Filter):
-    def filter(self, record):
-        return True
+    Args:
+        config_path: Path to the configuration JSON file
 
-class CustomColoredFormatter(colorlog.ColoredFormatter):
-    def format(self, record):
-        return super().format(record)
+    Returns:
+        MappingProxyType: Read-only view of the parsed configuration
+    """
+    try:
+        return MappingProxyType(orjson.loads(Path(config_path).read_bytes()))
+    except Exception as e:
+        raise RuntimeError(f"Failed to load config from {config_path}: {e}")
 
 class Config:
     """Configuration manager that loads and validates config from JSON."""
@@ -55,13 +59,9 @@ class Config:
         config_data = self._load_config(config_path)
         self._config = ConfigModel(**config_data)
         
-    def _load_config(self, config_path: str) -> dict:
+    def _load_config(self, config_path: str) -> MappingProxyType:
         """Load configuration from JSON file."""
-        try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load config from {config_path}: {e}")
+        return load_config_file(config_path)
 
     def __getattr__(self, name: str):
         """Delegate attribute access to the Pydantic model."""
@@ -70,58 +70,5 @@ class Config:
         except AttributeError:
             raise AttributeError(f"'Config' object has no attribute '{name}'")
 
-    def setup_logging(self):
-        """Set up logging configuration."""
-        # Clear any existing handlers
-        root_logger = logging.getLogger()
-        for handler in root_logger.handlers[:]:
-            root_logger.removeHandler(handler)
-
-        # Set up console logging if enabled
-        if self._config.logging.console.enabled:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(self._config.logging.console.get_level())
-            console_formatter = CustomColoredFormatter(
-                fmt='%(log_color)s' + self._config.logging.console.format,
-                datefmt=self._config.logging.console.date_format,
-                reset=True,
-                log_colors={
-                    'DEBUG': 'cyan',
-                    'INFO': 'green',
-                    'WARNING': 'yellow',
-                    'ERROR': 'red',
-                    'CRITICAL': 'red,bg_white',
-                }
-            )
-            console_handler.setFormatter(console_formatter)
-            root_logger.addHandler(console_handler)
-
-        # Set up file logging if enabled
-        if self._config.logging.file.enabled:
-            os.makedirs(self._config.logging.file.log_dir, exist_ok=True)
-            log_path = os.path.join(
-                self._config.logging.file.log_dir,
-                self._config.logging.file.filename
-            )
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_path,
-                maxBytes=self._config.logging.file.max_bytes,
-                backupCount=self._config.logging.file.backup_count
-            )
-            file_handler.setLevel(self._config.logging.file.get_level())
-            file_formatter = logging.Formatter(
-                fmt=self._config.logging.file.format,
-                datefmt=self._config.logging.file.date_format
-            )
-            file_handler.setFormatter(file_formatter)
-            root_logger.addHandler(file_handler)
-
-        # Set root logger level to the minimum of console and file levels
-        min_level = min(
-            self._config.logging.console.get_level() if self._config.logging.console.enabled else logging.CRITICAL,
-            self._config.logging.file.get_level() if self._config.logging.file.enabled else logging.CRITICAL
-        )
-        root_logger.setLevel(min_level)
-
 # Get the root directory of the project
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -1,18 +1,35 @@
-import json
 import logging
 import os
+import re
+import threading
 import time
 import uuid
-import requests
+import aiohttp
+import orjson
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from dataclasses import dataclass
 from uuid import UUID
-from datetime import datetime
+from local_app.http_pool import get_session
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Request bodies are pre-encoded with orjson, so the content type is set explicitly
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Devices may be constructed concurrently; only one of them should register the aggregator
+_aggregator_lock = threading.Lock()
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+def _cache_ttl(cache_control: Optional[str]) -> int:
+    """Seconds a response may be reused according to its Cache-Control header (0 if not cacheable)"""
+    if not cache_control or 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return int(match.group(1)) if match else 0
+
+@dataclass(slots=True)
 class MetricDTO:
     type: str  # e.g., "GPBtoEURexchangeRate", "RAMPercent", "Temperature"
     value: float
@@ -29,7 +46,13 @@ class BaseDevice:
         self.aggregator_uuid: Optional[uuid.UUID] = None
         # Create a logger with the device name for better log identification
         self.logger = logging.getLogger(f"{__name__}.{device_name}")
+        # Share one HTTP session across polls and devices so connections are kept alive
+        self._session = get_session()
+        self._response_cache: Dict[str, Tuple[float, Any]] = {}  # {url: (expires_at, data)}
         self._load_or_request_uuid()
+        # UUIDs never change after registration, so format them once for payloads
+        self.uuid_str = str(self.uuid)
+        self.aggregator_uuid_str = str(self.aggregator_uuid)
 
     def _load_or_request_uuid(self):
         """Load UUID from guid file or request a new one from server"""
@@ -40,64 +63,67 @@ class BaseDevice:
         guid_path = device_dir / "guid"
         
         # First, get or create aggregator UUID
-        if aggregator_path.exists():
-            with open(aggregator_path, "r") as f:
-                self.aggregator_uuid = uuid.UUID(f.read().strip())
-            logger.info(f"Loaded existing aggregator UUID: {self.aggregator_uuid}")
-        else:
-            try:
-                # Request new aggregator UUID from server
-                response = requests.post(
-                    f"{self.base_url}/register/aggregator",
-                    json={"name": "LocalAggregator"}
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if data['status'] == 'OK':
-                        self.aggregator_uuid = uuid.UUID(data['uuid'])
-                        # Save the UUID
-                        aggregator_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(aggregator_path, "w") as f:
-                            f.write(str(self.aggregator_uuid))
-                        logger.info(f"Registered new aggregator UUID: {self.aggregator_uuid}")
+        with _aggregator_lock:
+            if aggregator_path.exists():
+                with open(aggregator_path, "r") as f:
+                    self.aggregator_uuid = uuid.UUID(f.read().strip())
+                logger.info("Loaded existing aggregator UUID: %s", self.aggregator_uuid)
+            else:
+                try:
+                    # Request new aggregator UUID from server
+                    response = self._session.post(
+                        f"{self.base_url}/register/aggregator",
+                        data=orjson.dumps({"name": "LocalAggregator"}),
+                        headers=JSON_HEADERS
+                    )
+                    if response.status_code == 200:
+                        data = orjson.loads(response.content)
+                        if data['status'] == 'OK':
+                            self.aggregator_uuid = uuid.UUID(data['uuid'])
+                            # Save the UUID
+                            aggregator_path.parent.mkdir(parents=True, exist_ok=True)
+                            with open(aggregator_path, "w") as f:
+                                f.write(str(self.aggregator_uuid))
+                            logger.info("Registered new aggregator UUID: %s", self.aggregator_uuid)
+                        else:
+                            raise Exception(f"Server returned error status: {data.get('message', data['status'])}")
                     else:
-                        raise Exception(f"Server returned error status: {data.get('message', data['status'])}")
-                else:
-                    raise Exception(f"Server returned status code: {response.status_code}")
-            except Exception as e:
-                logger.error(f"Error registering aggregator: {e}")
-                raise
+                        raise Exception(f"Server returned status code: {response.status_code}")
+                except Exception as e:
+                    logger.error("Error registering aggregator: %s", e)
+                    raise
         
         # Then, get or create device UUID
         if guid_path.exists():
             with open(guid_path, "r") as f:
                 self.uuid = uuid.UUID(f.read().strip())
-            logger.info(f"Loaded existing UUID for {self.device_name}: {self.uuid}")
+            logger.info("Loaded existing UUID for %s: %s", self.device_name, self.uuid)
         else:
             try:
                 # Request new UUID from server
-                response = requests.post(
+                response = self._session.post(
                     f"{self.base_url}/register/device",
-                    json={
+                    data=orjson.dumps({
                         "device_name": self.device_name,
                         "aggregator_uuid": str(self.aggregator_uuid)
-                    }
+                    }),
+                    headers=JSON_HEADERS
                 )
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     if data['status'] == 'OK':
                         self.uuid = uuid.UUID(data['uuid'])
                         # Save the UUID
                         device_dir.mkdir(parents=True, exist_ok=True)
                         with open(guid_path, "w") as f:
                             f.write(str(self.uuid))
-                        logger.info(f"Registered new UUID for {self.device_name}: {self.uuid}")
+                        logger.info("Registered new UUID for %s: %s", self.device_name, self.uuid)
                     else:
                         raise Exception(f"Server returned error status: {data.get('message', data['status'])}")
                 else:
                     raise Exception(f"Server returned status code: {response.status_code}")
             except Exception as e:
-                logger.error(f"Error registering device {self.device_name}: {e}")
+                logger.error("Error registering device %s: %s", self.device_name, e)
                 raise
 
     def create_metric(self, value: float) -> MetricDTO:
@@ -109,39 +135,29 @@ class BaseDevice:
             created_at=time.time()
         )
 
-    def publish_metrics(self, metrics: list[MetricDTO]):
-        """Publish metrics to the server"""
-        if not self.uuid:
-            raise Exception(f"No device ID for service {self.metric_type}")
-            
-        try:
-            # Convert metrics to new snapshot format
-            payload = {
-                "device_uuid": str(self.uuid),
-                "client_timestamp_utc": str(datetime.utcnow()),
-                "client_timezone_minutes": -time.timezone // 60,  # Convert seconds to minutes
-                "metric_values": [
-                    {
-                        "metric_type_name": metric.type,
-                        "value": metric.value
-                    }
-                    for metric in metrics
-                ]
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/metrics",
-                json=payload
-            )
-            
-            if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"Error publishing metrics: {response.status_code} - {error_data.get('message', 'Unknown error')}")
-                return
-                
-            data = response.json()
-            if data['status'] != 'OK':
-                logger.error(f"Error publishing metrics: {data.get('message', data['status'])}")
+    async def fetch_json(self, session: aiohttp.ClientSession, url: str) -> Any:
+        """
+        GET a JSON document, reusing the previous response while its Cache-Control max-age allows
+        
+        Args:
+            session: The application's shared aiohttp session
+            url: The URL to fetch
             
-        except Exception as e:
-            logger.error(f"Error publishing metrics: {e}")
+        Returns:
+            Any: The parsed JSON body
+        """
+        cached = self._response_cache.get(url)
+        if cached and time.monotonic() < cached[0]:
+            self.logger.debug("Using cached response for %s", url)
+            return cached[1]
+
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = orjson.loads(await response.read())
+            ttl = _cache_ttl(response.headers.get('Cache-Control'))
+
+        if ttl:
+            self._response_cache[url] = (time.monotonic() + ttl, data)
+        else:
+            self._response_cache.pop(url, None)
+        return data
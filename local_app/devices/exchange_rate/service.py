@@ -1,8 +1,10 @@
 import os
-import requests
+import aiohttp
 from typing import Optional, List
 from ..base_device import BaseDevice, MetricDTO
 
+RATE_URL = "https://api.frankfurter.app/latest?from=GBP&to=EUR"
+
 class ExchangeRateService(BaseDevice):
     def __init__(self, base_url: str, poll_interval: int):
         super().__init__(
@@ -12,36 +14,38 @@ class ExchangeRateService(BaseDevice):
             poll_interval=poll_interval
         )
         
-    def get_current_rate(self) -> Optional[float]:
+    async def get_current_rate(self, session: aiohttp.ClientSession) -> Optional[float]:
         """
         Get current GBP to EUR exchange rate using Frankfurter API
         
+        Args:
+            session: The application's shared aiohttp session
+        
         Returns:
             Optional[float]: The current exchange rate, or None if the API call fails
         """
-        url = "https://api.frankfurter.app/latest?from=GBP&to=EUR"
-        
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            data = await self.fetch_json(session, RATE_URL)
             
             # Extract the conversion rate
             rate = data["rates"]["EUR"]
             return round(rate, 4)
             
         except Exception as e:
-            self.logger.error(f"Error fetching exchange rate: {e}")
+            self.logger.error("Error fetching exchange rate: %s", e)
             return None
             
-    def get_current_metrics(self) -> List[MetricDTO]:
+    async def get_current_metrics(self, session: aiohttp.ClientSession) -> List[MetricDTO]:
         """
         Get current metrics
         
+        Args:
+            session: The application's shared aiohttp session
+        
         Returns:
             List[MetricDTO]: List containing the exchange rate metric, or an empty list if data is unavailable
         """
-        rate = self.get_current_rate()
+        rate = await self.get_current_rate(session)
         
         # Only create and return a metric if we have valid data
         if rate is not None:
@@ -1,5 +1,5 @@
 import psutil
-from typing import List
+from typing import List, Optional
 from ..base_device import BaseDevice, MetricDTO
 import time
 import logging
@@ -27,28 +27,31 @@ class LocalMetricsService(BaseDevice):
         try:
             # CPU Usage
             cpu_percent = psutil.cpu_percent(interval=1)
-            metrics.append(self.create_metric_with_type("CPUPercent", cpu_percent))
+            # One timestamp for the whole sample, so the readings travel as a single snapshot
+            created_at = time.time()
+            metrics.append(self.create_metric_with_type("CPUPercent", cpu_percent, created_at))
             
             # Memory Usage
             memory = psutil.virtual_memory()
-            metrics.append(self.create_metric_with_type("RAMPercent", memory.percent))
+            metrics.append(self.create_metric_with_type("RAMPercent", memory.percent, created_at))
             
             # Disk Usage
             disk = psutil.disk_usage('/')
-            metrics.append(self.create_metric_with_type("DiskPercent", disk.percent))
+            metrics.append(self.create_metric_with_type("DiskPercent", disk.percent, created_at))
             
         except Exception as e:
-            logger.error(f"Error collecting local system metrics: {e}")
+            logger.error("Error collecting local system metrics: %s", e)
             # Return an empty list instead of partial or default data
             return []
         
         return metrics
         
-    def create_metric_with_type(self, specific_type: str, value: float) -> MetricDTO:
-        """Create a metric with a specific type"""
+    def create_metric_with_type(self, specific_type: str, value: float,
+                                created_at: Optional[float] = None) -> MetricDTO:
+        """Create a metric with a specific type, stamped now unless a sample time is given"""
         return MetricDTO(
             type=specific_type,
             value=value,
             uuid=self.uuid,  # Always set the UUID from the device
-            created_at=time.time()
+            created_at=created_at if created_at is not None else time.time()
         )
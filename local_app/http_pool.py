@@ -0,0 +1,46 @@
+import random
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class JitterRetry(Retry):
+    """Retry policy using full-jitter exponential backoff, so clients don't retry in lockstep"""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+# Retry connection failures and transient server errors. POSTs are only retried when the
+# connection failed before the request was sent, since the server may have acted on them.
+RETRY_POLICY = JitterRetry(
+    total=5,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# One pooled session for the whole process, so every device reuses keep-alive connections
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Get the process-wide HTTP session, creating it on first use"""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=RETRY_POLICY)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+def shutdown():
+    """Close the shared session and its pooled connections"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
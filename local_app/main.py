@@ -6,187 +6,292 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 import asyncio
-import json
 import logging
 import signal
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterable
 import aiohttp
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 from devices.temperature.service import TemperatureService
 from devices.exchange_rate.service import ExchangeRateService
 from devices.local.service import LocalMetricsService
 from services.calculator import CalculatorService
 from devices.base_device import MetricDTO
-from utils.calculator import open_calculator
-from metrics_sdk import MetricsAPI, MetricSnapshotDTO, MetricValueDTO, StateAPI
+from metrics_sdk import MetricsAPI, MetricSnapshotDTO, MetricValueDTO, StateAPI, create_session
 from lib_utils.logger import Logger
-from local_app.config.config import Config
+from local_app.config.config import Config, load_config_file
+from local_app import http_pool
 
 logger = logging.getLogger(__name__)
 
+# Flush early once this many metrics are queued, rather than waiting for the send interval
+BATCH_THRESHOLD = 500
+# Upper bound on metrics handed to a single send_metrics call
+BATCH_MAX = 1000
+# Most metrics held in memory while the server is unreachable; the oldest are dropped beyond this
+MAX_QUEUED_METRICS = 10_000
+# Worker threads for all blocking work: collectors that block (e.g. psutil sampling)
+# and the SDK's queue file I/O, which aiofiles runs on the loop's default executor
+EXECUTOR_WORKERS = 4
+# Time allowed for pooled SSL connections to close after the shared session is closed
+SESSION_CLOSE_GRACE_SECONDS = 0.25
+# Local UTC offset in minutes; fixed for the lifetime of the process
+CLIENT_TIMEZONE_MINUTES = -time.timezone // 60
+
 class Application:
     def __init__(self):
         self._load_config()
+        # Created first: device registration at startup already runs on it
+        self._executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="app-worker")
         self._setup_devices()
         self._running = True
         self._event_loop = None
-        self._metrics_queue = []  # Queue to store metrics before sending
+        self._main_task = None  # Future gathering the collection and send tasks
+        self._run_task = None  # Task running run_async, including the final flush
+        self._metrics_queue = deque(maxlen=MAX_QUEUED_METRICS)  # Queue to store metrics before sending
+        self._send_wakeup = asyncio.Event()  # Set when metrics first arrive or the queue reaches BATCH_THRESHOLD
+        self._oldest_queued_at = 0.0  # time.monotonic() when the oldest queued metric arrived
+        self._http_session = None  # aiohttp session shared by the SDK clients
         self._state_api = None  # StateAPI instance
-        self._state_monitoring_task = None  # Task for monitoring state changes
+        self._state_monitoring_enabled = False  # Whether the StateAPI connected successfully
         # Use a persistent storage directory in the application directory
         metrics_storage = os.path.join(os.path.dirname(__file__), 'metrics_storage')
-        self._metrics_api = MetricsAPI(self.config['api']['base_url'], storage_dir=metrics_storage)
-        signal.signal(signal.SIGINT, self._handle_signal)
-        signal.signal(signal.SIGTERM, self._handle_signal)
+        self._metrics_api = MetricsAPI(self._base_url, storage_dir=metrics_storage)
 
     def _load_config(self):
         """Load configuration from file"""
         config_path = os.path.join(os.path.dirname(__file__), 'config.json')
         try:
-            with open(config_path, 'r') as f:
-                self.config = json.load(f)
-            # Add a send interval if not present
-            if 'send_interval' not in self.config['intervals']:
-                self.config['intervals']['send'] = 30  # Default 30 seconds
-            logger.info(f"Loaded configuration from {config_path}")
-        except Exception as e:
-            logger.error(f"Error loading config from {config_path}: {e}")
+            # Shares the parse with Config in main(); the mapping is cached, so don't mutate it
+            self.config = load_config_file(config_path)
+            # Hoist values read on every loop iteration out of the nested config dict
+            self._base_url = self.config['api']['base_url']
+            self._send_interval = self.config['intervals'].get('send', 30)  # Default 30 seconds
+            logger.info("Loaded configuration from %s", config_path)
+        except Exception:
+            logger.exception("Error loading config from %s", config_path)
             sys.exit(1)
 
     def _setup_devices(self):
         """Initialize device services"""
         try:
+            # Devices may register with the server when constructed, which is blocking HTTP;
+            # build them concurrently on the pool so startup waits on one round trip, not three
             logger.info("Initializing temperature service...")
-            self.temperature_service = TemperatureService(
-                base_url=self.config['api']['base_url'],
+            temperature_service = self._executor.submit(
+                TemperatureService,
+                base_url=self._base_url,
                 poll_interval=self.config['intervals']['temperature']
             )
             
             logger.info("Initializing exchange rate service...")
-            self.exchange_rate_service = ExchangeRateService(
-                base_url=self.config['api']['base_url'],
+            exchange_rate_service = self._executor.submit(
+                ExchangeRateService,
+                base_url=self._base_url,
                 poll_interval=self.config['intervals']['exchange_rate']
             )
             
             logger.info("Initializing local metrics service...")
-            self.local_metrics_service = LocalMetricsService(
-                base_url=self.config['api']['base_url'],
+            local_metrics_service = self._executor.submit(
+                LocalMetricsService,
+                base_url=self._base_url,
                 poll_interval=self.config['intervals']['local']
             )
 
+            self.temperature_service = temperature_service.result()
+            self.exchange_rate_service = exchange_rate_service.result()
+            self.local_metrics_service = local_metrics_service.result()
+
             logger.info("Initializing calculator service...")
             self.calculator_service = CalculatorService()
             
+            # Map metric types to their devices once, rather than on every lookup
+            self._device_map = {
+                'Temperature': self.temperature_service,
+                'GPBtoEURexchangeRate': self.exchange_rate_service,
+                'CPUPercent': self.local_metrics_service,
+                'RAMPercent': self.local_metrics_service,
+                'DiskPercent': self.local_metrics_service,
+                'local': self.local_metrics_service
+            }
+            
             logger.info("All services initialized successfully")
-        except Exception as e:
-            logger.error(f"Error setting up services: {e}")
+        except Exception:
+            logger.exception("Error setting up services")
             sys.exit(1)
 
     async def collect_service_metrics(self, service, interval):
         """Collect metrics from a specific service on its own interval"""
+        # Schedule against monotonic deadlines so collection time doesn't accumulate as drift
+        next_tick = time.monotonic()
+        failures = 0  # Consecutive collection errors
         while self._running:
             try:
-                metrics = service.get_current_metrics()
+                if asyncio.iscoroutinefunction(service.get_current_metrics):
+                    # Network-bound services fetch on the shared session without blocking the loop
+                    metrics = await service.get_current_metrics(self._http_session)
+                else:
+                    # Blocking collectors run on the pool so they don't stall the other tasks
+                    metrics = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, service.get_current_metrics
+                    )
                 if metrics:
-                    self._metrics_queue.extend(metrics)
-                    logger.info(f"Added {len(metrics)} metrics from {service.__class__.__name__} to queue")
-                await asyncio.sleep(interval)
-            except Exception as e:
-                logger.error(f"Error collecting metrics from {service.__class__.__name__}: {str(e)}")
-                if hasattr(e, '__traceback__'):
-                    import traceback
-                    logger.error(f"Traceback: {''.join(traceback.format_tb(e.__traceback__))}")
-                await asyncio.sleep(1)
+                    overflow = len(self._metrics_queue) + len(metrics) - MAX_QUEUED_METRICS
+                    if overflow > 0:
+                        logger.warning("Metrics queue full, dropping %d oldest metrics", overflow)
+                    if not self._metrics_queue:
+                        # The send deadline runs from the oldest queued metric, so wake the sender to arm it
+                        self._oldest_queued_at = time.monotonic()
+                        self._send_wakeup.set()
+                    self._metrics_queue.extend(metrics)  # deque discards from the left when full
+                    logger.debug("Added %d metrics from %s to queue", len(metrics), service.__class__.__name__)
+                    if len(self._metrics_queue) >= BATCH_THRESHOLD:
+                        self._send_wakeup.set()
+                next_tick += interval
+                failures = 0
+            except Exception:
+                logger.exception("Error collecting metrics from %s", service.__class__.__name__)
+                # Retry quickly after a one-off error, backing off towards the poll interval if it persists
+                next_tick = time.monotonic() + min(2 ** failures, interval)
+                failures += 1
+
+            now = time.monotonic()
+            if next_tick < now:
+                # Overran a whole interval; skip the missed ticks rather than bursting to catch up
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
 
     async def send_metrics_task(self):
-        """Task to periodically send queued metrics"""
+        """Task to send queued metrics once the oldest has waited a send interval or the batch threshold is hit"""
         while self._running:
+            self._send_wakeup.clear()
+            queue = self._metrics_queue  # Rebound each pass, since draining swaps in a fresh buffer
+            now = time.monotonic()
+            if queue and (len(queue) >= BATCH_THRESHOLD
+                          or now - self._oldest_queued_at >= self._send_interval):
+                if not await self._drain_metrics_queue():
+                    # Hold off a whole interval so a failing send isn't retried in a tight loop
+                    await asyncio.sleep(self._send_interval)
+                continue
+
+            # Sleep until the oldest metric is due; with nothing queued, until metrics arrive
+            timeout = self._oldest_queued_at + self._send_interval - now if queue else None
+            # Snapshots the SDK is holding back are retried as soon as their backoff expires,
+            # rather than waiting for the next send; with nothing queued there is no extra wakeup
+            retry_in = self._metrics_api.next_retry_in
+            if retry_in is not None:
+                timeout = retry_in if timeout is None else min(timeout, retry_in)
             try:
-                if self._metrics_queue:
-                    metrics = self._metrics_queue.copy()
-                    self._metrics_queue.clear()
-                    await self.send_metrics(metrics)
-            except Exception as e:
-                logger.error(f"Error in send_metrics_task: {e}")
-            finally:
-                await asyncio.sleep(self.config['intervals']['send'])
-
-    async def send_metrics(self, metrics: List[MetricDTO]) -> None:
+                await asyncio.wait_for(self._send_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if self._metrics_api.next_retry_in == 0:
+                    try:
+                        await self._metrics_api.flush_queue()
+                    except Exception:
+                        logger.exception("Error retrying queued snapshots")
+
+    async def _drain_metrics_queue(self) -> bool:
+        """
+        Send everything queued, putting a chunk back if sending it fails
+        
+        Returns:
+            bool: True if the queue was drained, False if a send failed
+        """
+        # Drain in bounded chunks so a backlog never becomes one huge request
+        queue = self._metrics_queue
+        while queue:
+            oldest_queued_at = self._oldest_queued_at  # Restored if the chunk has to be requeued
+            if len(queue) <= BATCH_MAX:
+                # Usual case: everything fits in one chunk, so hand over the whole buffer and let
+                # collectors fill a fresh one, rather than copying it out
+                metrics = queue
+                self._metrics_queue = queue = deque(maxlen=MAX_QUEUED_METRICS)
+            else:
+                popleft = queue.popleft
+                metrics = [popleft() for _ in range(BATCH_MAX)]
+            try:
+                await self.send_metrics(metrics)
+            except asyncio.CancelledError:
+                # Stopping mid-send: requeue the chunk so the shutdown flush still sees it
+                queue.extendleft(reversed(metrics))
+                self._oldest_queued_at = oldest_queued_at
+                raise
+            except Exception:
+                # The chunk was already taken off the queue; put it back rather than lose it
+                logger.exception("Error sending %d metrics, requeueing them", len(metrics))
+                queue.extendleft(reversed(metrics))
+                # A collector may have armed the fresh buffer meanwhile; the requeued metrics are older
+                self._oldest_queued_at = oldest_queued_at
+                return False
+        return True
+
+    async def send_metrics(self, metrics: Iterable[MetricDTO]) -> None:
         """Send metrics to API using the SDK"""
         if not metrics:
             return
 
-        # Create a snapshot for each individual metric
+        # Metrics without a collection time share a single timestamp for the batch
+        batch_time = time.time()
+
+        # Group metrics taken by the same device at the same moment into one snapshot
+        groups = {}
+        devices = {}  # Each metric type is resolved to its device once per call
         for metric in metrics:
-            device = self._get_device_for_metric(metric.type)
+            metric_type = metric.type
+            if metric_type in devices:
+                device = devices[metric_type]
+            else:
+                device = devices[metric_type] = self._get_device_for_metric(metric_type)
             if not device or not device.uuid:
-                logger.error(f"No valid device found for metric type: {metric.type}")
+                logger.error("No valid device found for metric type: %s", metric_type)
                 continue
 
-            # Create individual snapshot for this metric
-            snapshot = MetricSnapshotDTO(
-                device_uuid=str(device.uuid),
-                aggregator_uuid=str(device.aggregator_uuid),
-                client_timestamp=datetime.fromtimestamp(metric.created_at or time.time()).isoformat(),
-                client_timezone_minutes=-time.timezone // 60,
-                metrics=[MetricValueDTO(
-                    type=metric.type,
-                    value=metric.value
-                )]
-            )
+            # The values come from our own devices, so skip pydantic validation on the hot path
+            key = (device, metric.created_at or batch_time)
+            groups.setdefault(key, []).append(MetricValueDTO.model_construct(
+                type=metric_type,
+                value=float(metric.value)
+            ))
 
-            await self._metrics_api.send_metrics(snapshot)  # Queue the snapshot
+        # UUID strings were normalized once at device init
+        snapshots = [
+            MetricSnapshotDTO.model_construct(
+                device_uuid=device.uuid_str,
+                aggregator_uuid=device.aggregator_uuid_str,
+                client_timestamp=datetime.fromtimestamp(created_at).isoformat(),
+                client_timezone_minutes=CLIENT_TIMEZONE_MINUTES,
+                metrics=values
+            )
+            for (device, created_at), values in groups.items()
+        ]
 
-        # After queueing all snapshots, try to flush the queue
-        await self._metrics_api.flush_queue()
+        # Hand the whole tick to the SDK as one batch request; it queues them if the server is down
+        await self._metrics_api.send_metrics_batch(snapshots)
 
     def _get_device_for_metric(self, metric_type: str):
         """Get device instance for metric type"""
-        device_map = {
-            'Temperature': self.temperature_service,
-            'GPBtoEURexchangeRate': self.exchange_rate_service,
-            'CPUPercent': self.local_metrics_service,
-            'RAMPercent': self.local_metrics_service,
-            'DiskPercent': self.local_metrics_service,
-            'local': self.local_metrics_service
-        }
-        device = device_map.get(metric_type)
+        device = self._device_map.get(metric_type)
         if device:
-            logger.debug(f"Found device for metric type {metric_type}: uuid={device.uuid}, aggregator={device.aggregator_uuid}")
+            logger.debug("Found device for metric type %s: uuid=%s, aggregator=%s",
+                         metric_type, device.uuid, device.aggregator_uuid)
         return device
 
-    async def get_device_id(self, metric_type: str) -> str:
-        """Get device ID for metric type, using the appropriate device's UUID"""
-        # Map metric types to their devices
-        device_map = {
-            'Temperature': self.temperature_service,
-            'GPBtoEURexchangeRate': self.exchange_rate_service,
-            'CPUPercent': self.local_metrics_service,
-            'RAMPercent': self.local_metrics_service,
-            'DiskPercent': self.local_metrics_service,
-            'local': self.local_metrics_service  # Add mapping for local device type
-        }
-        
-        device = device_map.get(metric_type)
-        if not device:
-            logger.error(f"No device found for metric type: {metric_type}")
-            return None
-            
-        # Use the device's UUID directly
-        if device.uuid:
-            return str(device.uuid)
-            
-        logger.error(f"Device {device.device_name} has no UUID")
-        return None
-
     async def initialize(self):
         """Initialize async components"""
-        await self._metrics_api.connect()  # This will also load the persisted queue
+        # One keep-alive connection pool for both the metrics and state clients
+        self._http_session = create_session()
+        await self._metrics_api.connect(self._http_session)  # This will also load the persisted queue
         
         # Setup state monitoring
-        await self.setup_state_monitoring()
+        self._state_monitoring_enabled = await self.setup_state_monitoring()
 
     async def run_async(self):
         """Async main loop"""
@@ -194,47 +299,93 @@ class Application:
         try:
             # First initialize async components
             await self.initialize()
-            
+            if not self._running:
+                # A signal arrived before there were tasks to cancel; don't start them now
+                logger.info("Shutdown requested during startup")
+                return
+
             tasks = [
                 self.collect_service_metrics(
                     self.temperature_service,
-                    self.config['intervals']['temperature']
+                    self.temperature_service.poll_interval
                 ),
                 self.collect_service_metrics(
                     self.exchange_rate_service,
-                    self.config['intervals']['exchange_rate']
+                    self.exchange_rate_service.poll_interval
                 ),
                 self.collect_service_metrics(
                     self.local_metrics_service,
-                    self.config['intervals']['local']
+                    self.local_metrics_service.poll_interval
                 ),
                 self.send_metrics_task()
-                # The check_calculator task is replaced by the StateAPI monitor_state task
             ]
+            # State monitoring runs in the same task tree so shutdown cancels it too
+            if self._state_monitoring_enabled:
+                tasks.append(self.state_monitoring_task())
             
-            # Run all tasks concurrently
-            await asyncio.gather(*tasks)
-        except Exception as e:
-            logger.error(f"Error in async loop: {e}")
-            if hasattr(e, '__traceback__'):
-                import traceback
-                logger.error(f"Traceback: {''.join(traceback.format_tb(e.__traceback__))}")
+            # Run all tasks concurrently; a shutdown signal cancels them all at once.
+            # A task that fails is logged without taking the other collectors down with it
+            self._main_task = asyncio.gather(*tasks, return_exceptions=True)
+            for task, result in zip(tasks, await self._main_task):
+                if isinstance(result, Exception):
+                    logger.error("Task %s failed", task.__qualname__, exc_info=result)
+        except asyncio.CancelledError:
+            logger.info("Tasks cancelled")
+            await self._flush_pending()
+        except Exception:
+            logger.exception("Error in async loop")
+
+    async def _flush_pending(self):
+        """Hand metrics still held in memory to the SDK, so stopping doesn't lose up to a send interval of data"""
+        if not self._metrics_queue:
+            return
+        logger.info("Sending %d pending metrics before shutdown", len(self._metrics_queue))
+        # The SDK persists anything it can't deliver to its on-disk queue
+        if not await self._drain_metrics_queue():
+            logger.error("Could not send %d pending metrics during shutdown", len(self._metrics_queue))
 
     def _cleanup(self):
         """Cleanup resources"""
         logger.info("Shutting down application...")
+
+        if self._event_loop:
+            # Closes the SDK's queue file handle while the loop and executor are still up
+            self._event_loop.run_until_complete(self._metrics_api.close())
+
+        if self._http_session and not self._http_session.closed:
+            self._event_loop.run_until_complete(self._http_session.close())
+            # Pooled SSL connections finish closing on the next loop iterations; let them,
+            # so the keep-alive pool is torn down cleanly rather than warned about at exit
+            self._event_loop.run_until_complete(asyncio.sleep(SESSION_CLOSE_GRACE_SECONDS))
         
-        # Cancel the state monitoring task if it exists
-        if hasattr(self, '_state_monitoring_task') and self._state_monitoring_task:
-            self._state_monitoring_task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        http_pool.shutdown()
         
         if self._event_loop:
             self._event_loop.close()
 
-    def _handle_signal(self, signum, frame):
-        """Handle termination signals"""
+    def _handle_signal(self, signum, frame=None):
+        """Handle termination signals by cancelling the running tasks"""
+        if not self._running:
+            # A second signal while pending metrics are being flushed abandons the flush
+            logger.warning("Received signal %d again, exiting without sending pending metrics", signum)
+            if self._run_task:
+                self._event_loop.call_soon_threadsafe(self._run_task.cancel)
+            return
         logger.info("Received signal %d, shutting down...", signum)
         self._running = False
+        if self._main_task:
+            # Thread-safe so this also works from a plain signal.signal handler
+            self._event_loop.call_soon_threadsafe(self._main_task.cancel)
+
+    def _install_signal_handlers(self):
+        """Route SIGINT/SIGTERM through the event loop so shutdown doesn't wait on sleeps"""
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._event_loop.add_signal_handler(sig, self._handle_signal, sig)
+            except NotImplementedError:
+                # Windows event loops don't support add_signal_handler
+                signal.signal(sig, self._handle_signal)
 
     def run(self):
         """Main application loop"""
@@ -242,16 +393,22 @@ class Application:
         try:
             # Create a new event loop
             if self._event_loop is None:
+                # Prefer uvloop's libuv-based loop where it is installed
+                if uvloop is not None:
+                    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
                 self._event_loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(self._event_loop)
+                # One bounded pool for every blocking call, instead of asyncio's lazily sized default
+                self._event_loop.set_default_executor(self._executor)
+            self._install_signal_handlers()
             
             # Run the async loop
-            self._event_loop.run_until_complete(self.run_async())
-        except Exception as e:
-            logger.error(f"Error in main loop: {e}")
-            if hasattr(e, '__traceback__'):
-                import traceback
-                logger.error(f"Traceback: {''.join(traceback.format_tb(e.__traceback__))}")
+            self._run_task = self._event_loop.create_task(self.run_async())
+            self._event_loop.run_until_complete(self._run_task)
+        except asyncio.CancelledError:
+            logger.info("Shutdown flush abandoned")
+        except Exception:
+            logger.exception("Error in main loop")
         finally:
             self._cleanup()
 
@@ -259,42 +416,39 @@ class Application:
         """Setup state monitoring with the StateAPI"""
         try:
             # Initialize the StateAPI
-            self._state_api = StateAPI(self.config['api']['base_url'])
+            self._state_api = StateAPI(self._base_url)
             
             # Connect to the StateAPI
-            await self._state_api.connect()
+            await self._state_api.connect(self._http_session)
             
             # Register the calculator handler for any state change
             # Instead of registering for a specific state value, we'll modify StateAPI to support a special handler
-            self._state_api.register_action_handler("*", open_calculator)  # Use "*" to indicate any state change
+            # Reuse the CalculatorService built with the devices rather than a parallel helper
+            self._state_api.register_action_handler("*", self.calculator_service.open_calculator)  # Use "*" to indicate any state change
             
             # Set the debounce time (optional, default is 5 seconds)
             self._state_api.set_debounce_time(2)  # Set to 2 seconds to prevent rapid actions
             
-            # Start monitoring in a separate task
-            # We'll use a wrapper function to ensure the StateAPI is properly closed
-            async def monitor_state_wrapper():
-                try:
-                    # Use the default interval (2 seconds)
-                    await self._state_api.monitor_state()
-                except asyncio.CancelledError:
-                    logger.info("State monitoring task cancelled")
-                except Exception as e:
-                    logger.error(f"Error in state monitoring: {e}")
-                finally:
-                    # Ensure the StateAPI is closed when the task ends
-                    await self._state_api.close()
-                    logger.info("StateAPI closed")
-            
-            # Create the monitoring task
-            self._state_monitoring_task = asyncio.create_task(monitor_state_wrapper())
-            logger.info("State monitoring started")
-            
+            logger.info("State monitoring set up")
             return True
-        except Exception as e:
-            logger.error(f"Error setting up state monitoring: {e}")
+        except Exception:
+            logger.exception("Error setting up state monitoring")
             return False
 
+    async def state_monitoring_task(self):
+        """Task to monitor state changes, ensuring the StateAPI is closed when it ends"""
+        try:
+            # Long-poll the server rather than checking every 2 seconds
+            await self._state_api.monitor_state(long_poll_seconds=30)
+        except asyncio.CancelledError:
+            logger.info("State monitoring task cancelled")
+            raise
+        except Exception:
+            logger.exception("Error in state monitoring")
+        finally:
+            await self._state_api.close()
+            logger.info("StateAPI closed")
+
 def main():
     # Load configuration
     config_path = os.path.join(os.path.dirname(__file__), 'config.json')
@@ -302,12 +456,11 @@ def main():
     
     # Initialize logging using the shared logger
     global logger
-    logger = Logger.setup_from_config("Local App", config)
-    
-    # Set specific loggers to appropriate levels
-    logging.getLogger('metrics_sdk.api').setLevel(logging.INFO)  # Keep SDK at INFO to reduce noise
-    logging.getLogger('urllib3').setLevel(logging.WARNING)  # Reduce HTTP client noise
-    logging.getLogger('asyncio').setLevel(logging.WARNING)  # Reduce async noise
+    logger = Logger.setup_from_config("Local App", config, additional_loggers={
+        'metrics_sdk.api': 'INFO',  # Keep SDK at INFO to reduce noise
+        'urllib3': 'WARNING',  # Reduce HTTP client noise
+        'asyncio': 'WARNING',  # Reduce async noise
+    })
     
     app = Application()
     app.run()
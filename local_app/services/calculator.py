@@ -1,30 +1,37 @@
 import subprocess
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 class CalculatorService:
     def __init__(self):
         self.name = "calculator"
+        self._process: Optional[subprocess.Popen] = None  # Last calculator we launched
         logger.info("Calculator service initialized")
 
     def open_calculator(self):
         try:
+            # Repeated triggers while our calculator is still open don't spawn another one
+            if self._process is not None and self._process.poll() is None:
+                logger.info("Calculator already open (pid %d), not launching another", self._process.pid)
+                return True
             logger.info("Attempting to open calculator...")
-            subprocess.Popen('calc.exe')
+            self._process = subprocess.Popen('calc.exe')
             logger.info("Calculator opened successfully")
             return True
         except Exception as e:
-            logger.error(f"Error opening calculator: {e}")
+            logger.error("Error opening calculator: %s", e)
             return False
 
     @staticmethod
     def check_calculator_flag(response_data):
         try:
-            logger.info(f"Checking calculator flag in response: {response_data}")
+            # The full response is only worth formatting when debugging
+            logger.debug("Checking calculator flag in response: %s", response_data)
             flag = response_data.get('calculator_requested', False)
-            logger.info(f"Calculator flag value: {flag}")
+            logger.info("Calculator flag value: %s", flag)
             return flag
         except Exception as e:
-            logger.error(f"Error checking calculator flag: {e}")
+            logger.error("Error checking calculator flag: %s", e)
             return False
@@ -7,5 +7,6 @@ and handling state changes from the server.
 from .api import MetricsAPI
 from .dto import MetricSnapshotDTO, MetricValueDTO
 from .state_api import StateAPI
+from .session import create_session
 
-__all__ = ['MetricsAPI', 'MetricSnapshotDTO', 'MetricValueDTO', 'StateAPI']
+__all__ = ['MetricsAPI', 'MetricSnapshotDTO', 'MetricValueDTO', 'StateAPI', 'create_session']
@@ -4,31 +4,81 @@ from typing import List, Optional, Deque
 import logging
 from datetime import datetime
 from collections import deque
-import json
 import os
+import gzip
+import json
+import random
+import time
 import aiofiles
+import aiofiles.os
+import orjson
 from pathlib import Path
+from pydantic import BaseModel
 
 from .dto import MetricSnapshotDTO, MetricValueDTO
+from .session import create_session
 
 logger = logging.getLogger(__name__)
 
+# Request bodies are pre-encoded with orjson, so the content type is set explicitly
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Bodies larger than this are gzipped; below it the compression overhead isn't worth it
+GZIP_MIN_BYTES = 1024
+GZIP_HEADERS = {'Content-Type': 'application/json', 'Content-Encoding': 'gzip'}
+
+# Opening of the /metrics/batch body: {"snapshots": [...]}
+_BATCH_PREFIX = b'{"snapshots":'
+
+# Exponential backoff bounds (seconds) for retrying queued snapshots while the server is unreachable
+RETRY_BACKOFF_INITIAL = 2.0
+RETRY_BACKOFF_MAX = 300.0
+
+# Most snapshots posted at once when a rejected batch is retried one by one;
+# matches the session's per-host connection limit
+MAX_CONCURRENT_POSTS = 4
+
+# Most snapshots sent in one /metrics/batch request
+MAX_BATCH_SNAPSHOTS = 500
+
+# Most snapshots kept for retry during an outage; the oldest are dropped beyond this
+MAX_QUEUED_SNAPSHOTS = 10_000
+
+def _dto_default(obj):
+    """orjson fallback that hands over a DTO's fields shallowly; nested DTOs come back through here"""
+    if isinstance(obj, BaseModel):
+        # pydantic keeps exactly the model's fields in __dict__, so pass it as is rather than
+        # rebuilding it through the model's Python-level __iter__
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 class MetricsAPI:
     """Main class for interacting with the metrics collection server"""
     
-    def __init__(self, base_url: str, storage_dir: Optional[str] = None):
+    def __init__(self, base_url: str, storage_dir: Optional[str] = None,
+                 max_queue_size: int = MAX_QUEUED_SNAPSHOTS):
         """
         Initialize the MetricsAPI
         
         Args:
             base_url: The base URL of the metrics server
             storage_dir: Directory to store offline metrics queue (defaults to ./metrics_queue)
+            max_queue_size: Most snapshots held for retry; the oldest are dropped beyond this
         """
         self.base_url = base_url.rstrip('/')
+        self._metrics_url = f"{self.base_url}/metrics"
+        self._metrics_batch_url = f"{self.base_url}/metrics/batch"
         self._session: Optional[aiohttp.ClientSession] = None
-        self._queue: Deque[MetricSnapshotDTO] = deque()
+        self._owns_session = False  # Only close sessions we created ourselves
+        self._queue: Deque[MetricSnapshotDTO] = deque(maxlen=max_queue_size)
+        self._retry_backoff = 0.0  # Zero while the server is reachable
+        self._next_retry_at = 0.0  # time.monotonic() before which the queue isn't retried
         self._storage_dir = storage_dir or os.path.join(os.getcwd(), 'metrics_queue')
         self._queue_file = os.path.join(self._storage_dir, 'metrics_queue.json')
+        self._queue_fh = None  # Append handle on the queue file, opened on first use
+        self._queue_file_entries = 0  # Lines in the queue file, including ones since dropped from the queue
+        # Snapshots the server rejected outright are kept here rather than silently dropped
+        self._dead_letter_file = os.path.join(self._storage_dir, 'dead_letter.jsonl')
         self._ensure_storage_dir()
         self._cleanup_old_files()  # Clean up any old metric files
 
@@ -43,56 +93,130 @@ class MetricsAPI:
                 if file.name != 'metrics_queue.json':  # Don't delete our queue file
                     try:
                         os.remove(file)
-                        logger.info(f"Cleaned up old metric file: {file.name}")
+                        logger.info("Cleaned up old metric file: %s", file.name)
                     except Exception as e:
-                        logger.error(f"Error deleting old metric file {file.name}: {e}")
+                        logger.error("Error deleting old metric file %s: %s", file.name, e)
         except Exception as e:
-            logger.error(f"Error during cleanup of old metric files: {e}")
+            logger.error("Error during cleanup of old metric files: %s", e)
 
     async def _save_queue_to_disk(self):
-        """Save entire queue to a single JSON file"""
+        """Rewrite the queue file from the in-memory queue, one JSON snapshot per line"""
         try:
-            # Convert queue to list of dictionaries
-            queue_data = [snapshot.dict() for snapshot in self._queue]
+            await self._close_queue_file()
+            # orjson walks the snapshots directly, without building an intermediate dict per snapshot
+            queue_data = b''.join(orjson.dumps(snapshot, default=_dto_default) + b'\n' for snapshot in self._queue)
             
-            async with aiofiles.open(self._queue_file, 'w') as f:
-                await f.write(json.dumps(queue_data, indent=2))
+            async with aiofiles.open(self._queue_file, 'wb') as f:
+                await f.write(queue_data)
+            self._queue_file_entries = len(self._queue)
                 
-            logger.info(f"Successfully saved {len(self._queue)} snapshots to queue file")
+            logger.debug("Successfully saved %d snapshots to queue file", len(self._queue))
         except Exception as e:
-            logger.error(f"Failed to save queue to disk: {e}")
+            logger.error("Failed to save queue to disk: %s", e)
+
+    async def _append_to_queue_file(self, snapshots: List[MetricSnapshotDTO]):
+        """Persist newly queued snapshots by appending them to the queue file, kept open between calls"""
+        if not snapshots:
+            return
+        if self._queue_file_entries + len(snapshots) > 2 * self._queue.maxlen:
+            # Lines for snapshots the bounded queue has since dropped build up; compact the file instead
+            await self._save_queue_to_disk()
+            return
+        try:
+            if self._queue_fh is None:
+                self._queue_fh = await aiofiles.open(self._queue_file, 'ab')
+            await self._queue_fh.write(
+                b''.join(orjson.dumps(snapshot, default=_dto_default) + b'\n' for snapshot in snapshots)
+            )
+            await self._queue_fh.flush()
+            self._queue_file_entries += len(snapshots)
+            logger.debug("Appended %d snapshots to queue file", len(snapshots))
+        except Exception as e:
+            logger.error("Failed to append to queue file: %s", e)
+
+    async def _close_queue_file(self):
+        """Close the queue file's append handle, if open"""
+        if self._queue_fh is not None:
+            try:
+                await self._queue_fh.close()
+            except Exception as e:
+                logger.error("Error closing queue file: %s", e)
+            self._queue_fh = None
 
     async def _load_persisted_queue(self):
-        """Load persisted queue from single JSON file"""
+        """Load persisted queue from the queue file"""
         try:
             if not os.path.exists(self._queue_file):
                 return
 
-            async with aiofiles.open(self._queue_file, 'r') as f:
+            async with aiofiles.open(self._queue_file, 'rb') as f:
                 content = await f.read()
                 if not content:
                     return
-                    
-                queue_data = json.loads(content)
-                for snapshot_dict in queue_data:
-                    try:
-                        snapshot = MetricSnapshotDTO(**snapshot_dict)
-                        self._queue.append(snapshot)
-                    except Exception as e:
-                        logger.error(f"Error parsing persisted snapshot: {e}")
 
-            logger.info(f"Loaded {len(self._queue)} snapshots from persisted queue")
+            legacy = content.startswith(b'[')
+            records = None
+            if legacy:
+                # Queue files written before the switch to one snapshot per line. Appends made before
+                # such a file was rewritten can follow the array, so keep whatever comes after it
+                try:
+                    text = content.decode()
+                    array, end = json.JSONDecoder().raw_decode(text)
+                    records = [*array, *text[end:].encode().splitlines()]
+                except ValueError as e:
+                    logger.error("Error parsing legacy queue file, recovering it line by line: %s", e)
+            if records is None:
+                records = content.splitlines()
+            records = [record for record in records if not isinstance(record, bytes) or record.strip()]
+            self._queue_file_entries = len(records)
+            for record in records:
+                try:
+                    if isinstance(record, bytes):
+                        # pydantic-core parses and validates the line in one pass, with no intermediate dict
+                        snapshot = MetricSnapshotDTO.model_validate_json(record)
+                    else:
+                        snapshot = MetricSnapshotDTO.model_validate(record)
+                    self._queue.append(snapshot)
+                except Exception as e:
+                    # Includes a final line cut short by a crash mid-write
+                    logger.error("Error parsing persisted snapshot: %s", e)
+
+            if legacy:
+                # Rewrite as JSONL now, or the next append would land after the closing bracket
+                await self._save_queue_to_disk()
+            logger.info("Loaded %d snapshots from persisted queue", len(self._queue))
+
+        except Exception as e:
+            logger.error("Error loading persisted queue: %s", e)
 
+    def _enqueue(self, snapshots: List[MetricSnapshotDTO]):
+        """Add snapshots to the retry queue, warning if the bound forces old ones out"""
+        overflow = len(self._queue) + len(snapshots) - self._queue.maxlen
+        if overflow > 0:
+            logger.warning("Retry queue full, dropping %d oldest snapshots", overflow)
+        self._queue.extend(snapshots)
+
+    async def _dead_letter(self, snapshots: List[MetricSnapshotDTO]):
+        """Append rejected snapshots to the dead-letter file, one JSON document per line"""
+        try:
+            lines = b''.join(orjson.dumps(snapshot, default=_dto_default) + b'\n' for snapshot in snapshots)
+            async with aiofiles.open(self._dead_letter_file, 'ab') as f:
+                await f.write(lines)
+            logger.warning("Wrote %d rejected snapshots to %s", len(snapshots), self._dead_letter_file)
         except Exception as e:
-            logger.error(f"Error loading persisted queue: {e}")
+            logger.error("Failed to write dead-letter snapshots: %s", e)
 
     async def _clear_queue_file(self):
         """Clear the queue file after successful send"""
+        await self._close_queue_file()
+        self._queue_file_entries = 0
         try:
-            if os.path.exists(self._queue_file):
-                os.remove(self._queue_file)
+            # Removed on the executor like the other queue file I/O, so the loop never waits on the disk
+            await aiofiles.os.remove(self._queue_file)
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            logger.error(f"Error clearing queue file: {e}")
+            logger.error("Error clearing queue file: %s", e)
 
     async def __aenter__(self):
         """Support async context manager pattern"""
@@ -103,16 +227,24 @@ class MetricsAPI:
         """Clean up resources when used as context manager"""
         await self.close()
     
-    async def connect(self):
-        """Create the HTTP session and load persisted queue"""
+    async def connect(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Create the HTTP session and load persisted queue
+        
+        Args:
+            session: Optional shared session to use instead of creating one; it is not closed by close()
+        """
         if not self._session:
-            self._session = aiohttp.ClientSession()
+            self._owns_session = session is None
+            self._session = session or create_session()
             await self._load_persisted_queue()  # Load queue when connecting
     
     async def close(self):
-        """Close the HTTP session"""
+        """Close the HTTP session and the queue file"""
+        await self._close_queue_file()
         if self._session:
-            await self._session.close()
+            if self._owns_session:
+                await self._session.close()
             self._session = None
     
     def _ensure_session(self):
@@ -136,47 +268,125 @@ class MetricsAPI:
         self._ensure_session()
         
         try:
-            # First try to send any queued metrics
-            await self.flush_queue()
+            if time.monotonic() < self._next_retry_at:
+                # The server failed recently: queue without a network attempt until the backoff expires
+                logger.debug("Server unreachable, queueing %d snapshots without sending", len(snapshots))
+                self._enqueue(snapshots)
+                await self._append_to_queue_file(snapshots)
+                return True
+
+            backlog = len(self._queue)
+            if backlog and backlog + len(snapshots) <= MAX_BATCH_SNAPSHOTS:
+                # Deliver a small backlog in the same request as the new batch, oldest first
+                snapshots = [*self._queue, *snapshots]
+                self._queue.clear()
+            elif backlog:
+                # Too large to ride along: flush it separately first
+                backlog = 0
+                await self.flush_queue()
+                if time.monotonic() < self._next_retry_at:
+                    # The flush just found the server unreachable; don't spend a request on the new batch too
+                    self._enqueue(snapshots)
+                    await self._append_to_queue_file(snapshots)
+                    return True
             
-            # Then try to send the new batch
-            total_metrics = sum(len(snapshot.metrics) for snapshot in snapshots)
-            logger.info(f"Attempting to send batch of {len(snapshots)} snapshots ({total_metrics} metrics)")
+            log_info = logger.isEnabledFor(logging.INFO)
+            if log_info:
+                total_metrics = sum(len(snapshot.metrics) for snapshot in snapshots)
+                logger.info("Attempting to send batch of %d snapshots (%d metrics)", len(snapshots), total_metrics)
             
-            success = True
-            for snapshot in snapshots:
-                try:
-                    async with self._session.post(
-                        f"{self.base_url}/metrics",
-                        json=snapshot.dict()
-                    ) as response:
-                        if response.status == 200:
-                            continue
-                        elif response.status >= 500:
-                            await self._queue_metric(snapshot)
-                        else:
-                            error_text = await response.text()
-                            logger.error(f"Failed to send snapshot. Status: {response.status}, Error: {error_text}")
-                            success = False
-                            
-                except aiohttp.ClientError as e:
-                    # Connection error - queue for retry
-                    logger.warning("Cannot connect to web app. Caching metrics for later retry.")
-                    logger.debug(f"Connection error details: {str(e)}")
-                    await self._queue_metric(snapshot)
-                    
-                except Exception as e:
-                    # Unrecoverable error
-                    logger.error(f"Unrecoverable error sending metrics: {str(e)}")
-                    success = False
-
-            if success:
-                logger.info(f"Successfully sent batch of {len(snapshots)} snapshots ({total_metrics} metrics)")
+            # Post the whole batch in one request; keep it for later if the server is unavailable
+            success = await self._post_batch(snapshots)
+            if success is None:
+                logger.warning("Cannot deliver %d snapshots. Caching metrics for later retry.", len(snapshots))
+                self._enqueue(snapshots)
+                self._schedule_retry()
+                # A backlog sent along with the batch is already in the queue file
+                await self._append_to_queue_file(snapshots[backlog:])
+                return True
+            retry = []
+            if not success:
+                # The server rejects a batch as a whole; find the offending snapshots individually
+                retry, rejected = await self._post_individually(snapshots)
+                if rejected:
+                    await self._dead_letter(rejected)
+                if retry:
+                    logger.warning("Server not reachable for %d snapshots. Keeping metrics in queue.", len(retry))
+                    self._queue.extendleft(reversed(retry))
+                    self._schedule_retry()
+                success = not rejected
+            elif log_info:
+                logger.info("Successfully sent batch of %d snapshots (%d metrics)", len(snapshots), total_metrics)
+            if backlog and not retry:
+                self._retry_backoff = 0.0
+            if backlog or retry:
+                # The queue file no longer matches the queue: rewrite it, or drop it once nothing is left
+                if self._queue:
+                    await self._save_queue_to_disk()
+                else:
+                    await self._clear_queue_file()
             return success
                     
         except Exception as e:
             # Unrecoverable error
-            logger.error(f"Unrecoverable error sending metrics batch: {str(e)}")
+            logger.error("Unrecoverable error sending metrics batch: %s", e)
+            return False
+
+    async def _post_snapshot(self, snapshot: MetricSnapshotDTO) -> Optional[bool]:
+        """
+        POST a single snapshot to the server
+        
+        Args:
+            snapshot: MetricSnapshotDTO to send
+            
+        Returns:
+            Optional[bool]: True if accepted, False if rejected and not worth retrying,
+                            None if the server was unavailable and it should be retried later
+        """
+        return await self._post(self._metrics_url, orjson.dumps(snapshot, default=_dto_default))
+
+    async def _post_batch(self, snapshots: List[MetricSnapshotDTO]) -> Optional[bool]:
+        """
+        POST several snapshots to the server's batch endpoint in one request
+        
+        Args:
+            snapshots: List of MetricSnapshotDTO to send
+            
+        Returns:
+            Optional[bool]: True if accepted, False if rejected and not worth retrying,
+                            None if the server was unavailable and it should be retried later
+        """
+        # The envelope is fixed, so wrap the encoded list rather than building a dict around it
+        body = _BATCH_PREFIX + orjson.dumps(snapshots, default=_dto_default) + b'}'
+        return await self._post(self._metrics_batch_url, body)
+
+    async def _post(self, url: str, body: bytes) -> Optional[bool]:
+        """POST an encoded JSON body, classifying the outcome as for _post_snapshot"""
+        headers = JSON_HEADERS
+        if len(body) > GZIP_MIN_BYTES:
+            # Level 1 gets most of the size reduction for a fraction of the CPU of the default
+            body = gzip.compress(body, compresslevel=1)
+            headers = GZIP_HEADERS
+        try:
+            async with self._session.post(
+                url,
+                data=body,
+                headers=headers
+            ) as response:
+                if response.status == 200:
+                    return True
+                error_text = await response.text()
+                if response.status >= 500:
+                    logger.debug("Server error (HTTP %d): %s", response.status, error_text)
+                    return None
+                logger.error("Failed to send metrics. Status: %s, Error: %s", response.status, error_text)
+                return False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # A request timeout means a slow server, not a bad snapshot, so retry it later
+            logger.debug("Connection error details: %r", e)
+            return None
+        except Exception as e:
+            logger.error("Unrecoverable error sending snapshot: %s", e)
             return False
 
     async def send_metrics(self, snapshot: MetricSnapshotDTO) -> bool:
@@ -194,13 +404,52 @@ class MetricsAPI:
 
     async def _queue_metric(self, snapshot: MetricSnapshotDTO):
         """Add a metric snapshot to the retry queue and persist to disk"""
-        self._queue.append(snapshot)
-        await self._save_queue_to_disk()
-        logger.info(f"Cached metric snapshot for later delivery (queue size: {len(self._queue)})")
+        self._enqueue([snapshot])
+        await self._append_to_queue_file([snapshot])
+        logger.debug("Cached metric snapshot for later delivery (queue size: %d)", len(self._queue))
+
+    async def _post_individually(self, snapshots: List[MetricSnapshotDTO]):
+        """
+        POST snapshots one per request, a bounded number at a time
+        
+        Args:
+            snapshots: List of MetricSnapshotDTO to send
+            
+        Returns:
+            Tuple of (snapshots to retry later, snapshots the server rejected), each in original order
+        """
+        # Bound the number in flight so they don't pile up on the connection pool,
+        # where waiting counts against each request's timeout
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_POSTS)
+
+        async def post(snapshot: MetricSnapshotDTO) -> Optional[bool]:
+            async with semaphore:
+                return await self._post_snapshot(snapshot)
+
+        results = await asyncio.gather(*(post(snapshot) for snapshot in snapshots))
+
+        # Sort the outcomes in one pass
+        retry = []
+        rejected = []
+        for snapshot, result in zip(snapshots, results):
+            if result is None:
+                retry.append(snapshot)
+            elif result is False:
+                rejected.append(snapshot)
+        return retry, rejected
+
+    def _schedule_retry(self):
+        """Back off exponentially before the queue is retried again"""
+        self._retry_backoff = min(max(self._retry_backoff * 2, RETRY_BACKOFF_INITIAL), RETRY_BACKOFF_MAX)
+        # Full jitter, so aggregators that lost the server together don't all retry together
+        delay = random.uniform(0, self._retry_backoff)
+        self._next_retry_at = time.monotonic() + delay
+        logger.debug("Retrying queued snapshots in %.0fs", delay)
 
     async def flush_queue(self) -> bool:
         """
-        Attempt to send all queued metric snapshots to the server
+        Attempt to send all queued metric snapshots to the server.
+        While backing off after a failed attempt the queue is left untouched.
         
         Returns:
             bool: True if all metrics were sent successfully, False otherwise
@@ -208,53 +457,61 @@ class MetricsAPI:
         if not self._queue:
             return True
 
+        if time.monotonic() < self._next_retry_at:
+            logger.debug("Server unreachable, deferring %d queued snapshots", len(self._queue))
+            return False
+
         total_snapshots = len(self._queue)
-        logger.info(f"Attempting to send {total_snapshots} queued metric snapshots")
+        logger.info("Attempting to send %d queued metric snapshots", total_snapshots)
 
-        success = True
-        # Process each snapshot individually
-        while self._queue:
-            snapshot = self._queue[0]  # Look at first snapshot
-            try:
-                # Send individual snapshot
-                async with self._session.post(
-                    f"{self.base_url}/metrics",
-                    json=snapshot.dict()
-                ) as response:
-                    if response.status == 200:
-                        self._queue.popleft()  # Only remove if successful
-                    else:
-                        error_text = await response.text()
-                        if response.status >= 500:
-                            logger.warning(f"Server error (HTTP {response.status}). Will retry later.")
-                            logger.debug(f"Server response: {error_text}")
-                            success = False
-                            break  # Stop processing on server error
-                        else:
-                            logger.error(f"Failed to send metrics. Status: {response.status}, Error: {error_text}")
-                            self._queue.popleft()  # Remove on client error as it won't succeed on retry
-                            success = False
-
-            except aiohttp.ClientError as e:
-                logger.warning("Server not reachable. Keeping metrics in queue.")
-                logger.debug(f"Connection error details: {str(e)}")
-                success = False
-                break  # Stop processing on connection error
-            except Exception as e:
-                logger.error(f"Error sending queued metrics: {str(e)}")
-                self._queue.popleft()  # Remove on unrecoverable error
-                success = False
+        # Take the queued snapshots out and replay them through the batch endpoint, a chunk per request
+        snapshots = list(self._queue)
+        self._queue.clear()
+        retry = []
+        rejected = []
+        for start in range(0, len(snapshots), MAX_BATCH_SNAPSHOTS):
+            chunk = snapshots[start:start + MAX_BATCH_SNAPSHOTS]
+            result = await self._post_batch(chunk)
+            if result is None:
+                # The server is unavailable: keep this chunk and the rest, in order, for the next retry
+                retry = snapshots[start:]
+                break
+            if result is False:
+                # The server rejects a batch as a whole; find the offending snapshots individually
+                chunk_retry, chunk_rejected = await self._post_individually(chunk)
+                rejected.extend(chunk_rejected)
+                if chunk_retry:
+                    retry = chunk_retry + snapshots[start + MAX_BATCH_SNAPSHOTS:]
+                    break
+
+        if rejected:
+            await self._dead_letter(rejected)
+        if retry:
+            logger.warning("Server not reachable for %d snapshots. Keeping metrics in queue.", len(retry))
+            self._queue.extendleft(reversed(retry))
+            self._schedule_retry()
+        else:
+            self._retry_backoff = 0.0
+
+        success = not retry and not rejected
 
         # Save remaining queue if any
         if self._queue:
             await self._save_queue_to_disk()
-            logger.info(f"Saved remaining {len(self._queue)} snapshots to queue")
+            logger.info("Saved remaining %d snapshots to queue", len(self._queue))
         else:
             await self._clear_queue_file()
-            logger.info("Queue successfully cleared")
+            logger.debug("Queue successfully cleared")
 
         return success
 
+    @property
+    def next_retry_in(self) -> Optional[float]:
+        """Seconds until the queued snapshots are due for retry, or None if nothing is queued"""
+        if not self._queue:
+            return None
+        return max(0.0, self._next_retry_at - time.monotonic())
+
     @property
     def queue_size(self) -> int:
         """Get the number of metric snapshots in the queue"""
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, validator, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Optional
 from datetime import datetime
 import uuid
@@ -17,25 +17,21 @@ class MetricValueDTO(BaseModel):
     type: str = Field(..., alias='metric_type_name')  # Use type in JSON, but metric_type_name in Python
     value: float
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 class MetricSnapshotDTO(BaseModel):
     """Data transfer object for metric snapshots with their values"""
     device_uuid: str
     aggregator_uuid: str
-    client_timestamp: str = Field(alias='client_timestamp_utc')  # Match Flask app's expected field name
+    # Match Flask app's expected field name; stamped at construction if not given
+    client_timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat(),
+                                  alias='client_timestamp_utc')
     client_timezone_minutes: int
     metrics: List[MetricValueDTO]  # This will be used both internally and in JSON
 
-    @validator('device_uuid', 'aggregator_uuid')
+    @field_validator('device_uuid', 'aggregator_uuid')
+    @classmethod
     def normalize_uuids(cls, v):
         return normalize_uuid(v)
 
-    def __init__(self, **data):
-        if 'client_timestamp' not in data and 'client_timestamp_utc' not in data:
-            data['client_timestamp'] = datetime.utcnow().isoformat()
-        super().__init__(**data)
-
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
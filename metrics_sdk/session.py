@@ -0,0 +1,35 @@
+"""
+HTTP session factory for the metrics SDK.
+This module provides a single keep-alive aiohttp session that MetricsAPI and
+StateAPI can share, so both talk to the server over the same connection pool.
+"""
+
+import aiohttp
+
+# The SDK only talks to a couple of endpoints on one host, so a small pool is plenty
+CONNECTION_LIMIT = 8
+CONNECTION_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL_SECONDS = 600
+KEEPALIVE_TIMEOUT_SECONDS = 75
+# Fail fast when the server is down instead of waiting out aiohttp's 5 minute default
+CONNECT_TIMEOUT_SECONDS = 5
+REQUEST_TIMEOUT_SECONDS = 30
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create a ClientSession with a pooled, keep-alive connector
+    
+    Returns:
+        aiohttp.ClientSession: A new session; the caller is responsible for closing it
+    """
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+        keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS, sock_connect=CONNECT_TIMEOUT_SECONDS),
+        headers={'Accept-Encoding': 'gzip, deflate'}
+    )
@@ -6,11 +6,17 @@ This module provides a clean interface for checking and handling state changes.
 import aiohttp
 import asyncio
 import logging
+import orjson
 from typing import Optional, Callable, Dict, Any
 import time
 
+from .session import create_session
+
 logger = logging.getLogger(__name__)
 
+# Longest wait between state checks while they keep failing
+MAX_RETRY_INTERVAL_SECONDS = 30
+
 class StateAPI:
     """Class for interacting with the state toggle system"""
     
@@ -22,12 +28,16 @@ class StateAPI:
             base_url: The base URL of the server
         """
         self.base_url = base_url.rstrip('/')
+        self._check_state_url = f"{self.base_url}/check-state"
+        self._request_kwargs: Dict[float, Dict[str, Any]] = {}  # check_state kwargs per wait duration
         self._session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False  # Only close sessions we created ourselves
         self._last_checked_timestamp: Optional[str] = None
         self._action_handlers: Dict[str, Callable] = {}
-        self._last_action_time = 0  # Track when the last action was performed
+        self._last_action_time = float('-inf')  # time.monotonic() of the last action performed
         self._debounce_seconds = 5  # Default debounce time
         self._last_state_value = None  # Track the last state value
+        self._server_unavailable = False  # Set while the server can't be reached, so it's logged once
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -39,16 +49,23 @@ class StateAPI:
         await self.close()
         logger.info("StateAPI closed via context manager")
         
-    async def connect(self):
-        """Create a new session"""
+    async def connect(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Create a new session
+        
+        Args:
+            session: Optional shared session to use instead of creating one; it is not closed by close()
+        """
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._owns_session = session is None
+            self._session = session or create_session()
             logger.info("StateAPI connected")
             
     async def close(self):
         """Close the session"""
         if self._session and not self._session.closed:
-            await self._session.close()
+            if self._owns_session:
+                await self._session.close()
             self._session = None
             logger.info("StateAPI session closed")
             
@@ -66,7 +83,7 @@ class StateAPI:
                          Use "*" to trigger the handler for any state change.
             handler: The function to call when the state changes to the specified value
         """
-        logger.info(f"Registering handler for state '{state_value}'")
+        logger.info("Registering handler for state '%s'", state_value)
         self._action_handlers[state_value] = handler
         
     def set_debounce_time(self, seconds: int):
@@ -77,113 +94,172 @@ class StateAPI:
             seconds: The number of seconds to wait between actions
         """
         self._debounce_seconds = seconds
-        logger.info(f"Set action debounce time to {seconds} seconds")
+        logger.info("Set action debounce time to %s seconds", seconds)
         
-    async def check_state(self) -> Optional[Dict[str, Any]]:
+    async def check_state(self, wait_seconds: float = 0) -> Optional[Dict[str, Any]]:
         """
         Check the current state
         
+        Args:
+            wait_seconds: If non-zero, long-poll: the server holds the request open
+                          until the state changes or this many seconds elapse
+        
         Returns:
             The current state as a dictionary, or None if there was an error
         """
         self._ensure_session()
         
+        request_kwargs = self._request_kwargs.get(wait_seconds)
+        if request_kwargs is None:
+            request_kwargs = {}
+            if wait_seconds:
+                request_kwargs['params'] = {'wait': wait_seconds}
+                # Leave headroom over the server-side wait so the request isn't cut short
+                request_kwargs['timeout'] = aiohttp.ClientTimeout(total=wait_seconds + 5)
+            # The poll duration is fixed per monitor, so build these once rather than per request
+            self._request_kwargs[wait_seconds] = request_kwargs
+        
         try:
-            async with self._session.get(f"{self.base_url}/check-state") as response:
+            async with self._session.get(self._check_state_url, **request_kwargs) as response:
                 if response.status == 200:
-                    state = await response.json()
-                    logger.debug(f"Retrieved state: {state}")
+                    # Parse the raw body with orjson rather than aiohttp's stdlib-json path
+                    state = orjson.loads(await response.read())
+                    logger.debug("Retrieved state: %s", state)
+                    if self._server_unavailable:
+                        logger.info("State server reachable again")
+                        self._server_unavailable = False
                     return state
                 else:
-                    logger.error(f"Error checking state: {response.status}")
+                    logger.error("Error checking state: %d", response.status)
                     return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Expected while the web app is offline: report the outage once, not on every retry
+            if not self._server_unavailable:
+                logger.warning("State server unavailable - web app appears to be offline: %s", e)
+                self._server_unavailable = True
+            else:
+                logger.debug("State server still unavailable: %s", e)
+            return None
         except Exception as e:
-            logger.error(f"Exception checking state: {e}")
+            logger.error("Exception checking state: %s", e)
             return None
             
-    async def handle_state_change(self):
+    async def handle_state_change(self, wait_seconds: float = 0) -> bool:
         """
         Check for state changes and execute the appropriate handler if a change is detected.
+        
+        Args:
+            wait_seconds: Long-poll duration passed to check_state once state tracking is initialized
+            
+        Returns:
+            bool: True if a state was retrieved from the server, False otherwise
         """
         try:
-            state = await self.check_state()
+            # The first check must return immediately so tracking can be initialized
+            state = await self.check_state(wait_seconds if self._last_state_value is not None else 0)
             if not state or 'value' not in state:
-                return
+                return False
             
             current_state_value = state['value']
-            current_time = time.time()
+            current_time = time.monotonic()  # Only used for debounce intervals
             
             # Log the current and last state values for debugging
-            logger.debug(f"Current state: {current_state_value}, Last state: {self._last_state_value}")
+            logger.debug("Current state: %s, Last state: %s", current_state_value, self._last_state_value)
             
             # Initialize last state value if this is the first check
             if self._last_state_value is None:
-                logger.info(f"Initializing state tracking with state: {current_state_value}")
+                logger.info("Initializing state tracking with state: %s", current_state_value)
                 self._last_state_value = current_state_value
                 self._last_checked_timestamp = state.get('timestamp')
-                return
+                return True
             
             # Only trigger handlers if the state value has changed to B
             # We don't trigger when it changes back to A since that's automatic
             if current_state_value != self._last_state_value and current_state_value == "B":
-                logger.info(f"State changed from {self._last_state_value} to {current_state_value}")
+                logger.info("State changed from %s to %s", self._last_state_value, current_state_value)
                 
                 # Check if enough time has passed since the last action (debounce)
                 if current_time - self._last_action_time >= self._debounce_seconds:
                     # Check for wildcard handler first
                     if "*" in self._action_handlers:
-                        logger.info(f"Executing wildcard handler for state change to {current_state_value}")
+                        logger.info("Executing wildcard handler for state change to %s", current_state_value)
                         try:
                             self._action_handlers["*"]()
                             self._last_action_time = current_time
                         except Exception as e:
-                            logger.error(f"Error executing wildcard handler: {e}")
+                            logger.error("Error executing wildcard handler: %s", e)
                     # Then check for specific state handler
                     elif current_state_value in self._action_handlers:
-                        logger.info(f"Executing handler for state {current_state_value}")
+                        logger.info("Executing handler for state %s", current_state_value)
                         try:
                             self._action_handlers[current_state_value]()
                             self._last_action_time = current_time
                         except Exception as e:
-                            logger.error(f"Error executing handler for state {current_state_value}: {e}")
+                            logger.error("Error executing handler for state %s: %s", current_state_value, e)
                     else:
-                        logger.info(f"No handler registered for state {current_state_value}")
+                        logger.info("No handler registered for state %s", current_state_value)
                 else:
-                    logger.info(f"Debouncing action for state {current_state_value} " +
-                               f"({current_time - self._last_action_time:.2f}s < {self._debounce_seconds}s)")
+                    logger.info("Debouncing action for state %s (%.2fs < %ss)",
+                                current_state_value, current_time - self._last_action_time,
+                                self._debounce_seconds)
             elif current_state_value != self._last_state_value:
                 # Log state changes that don't trigger actions (e.g., B to A)
-                logger.info(f"State changed from {self._last_state_value} to {current_state_value} (no action needed)")
+                logger.info("State changed from %s to %s (no action needed)", self._last_state_value, current_state_value)
             
             # Always update the last state value
             self._last_state_value = current_state_value
             self._last_checked_timestamp = state.get('timestamp')
+            return True
             
         except Exception as e:
-            logger.error(f"Error handling state change: {e}")
+            logger.error("Error handling state change: %s", e)
+            return False
         
-    async def monitor_state(self, interval_seconds: float = 2.0):
+    async def monitor_state(self, interval_seconds: float = 2.0, long_poll_seconds: float = 0):
         """
         Continuously monitor the state and execute handlers when changes are detected
         
         Args:
-            interval_seconds: The interval in seconds between state checks
+            interval_seconds: The interval in seconds between state checks (the shortest cycle
+                              when long-polling, in case the server answers at once), and the initial
+                              retry delay after a failed check; it doubles with each
+                              consecutive failure up to MAX_RETRY_INTERVAL_SECONDS
+            long_poll_seconds: If non-zero, long-poll the server for up to this many
+                               seconds per request instead of polling on an interval
         """
-        logger.info(f"Starting state monitoring with interval of {interval_seconds} seconds")
+        if long_poll_seconds:
+            logger.info("Starting state monitoring with %s second long-poll", long_poll_seconds)
+        else:
+            logger.info("Starting state monitoring with interval of %s seconds", interval_seconds)
         
+        failures = 0  # Consecutive failed checks, for backing off while the server is down
         try:
             while True:
+                received = False
+                started = time.monotonic()
                 try:
                     # Check for state changes and execute handlers if needed
-                    await self.handle_state_change()
+                    received = await self.handle_state_change(long_poll_seconds)
                 except Exception as e:
-                    logger.error(f"Error in state monitoring cycle: {e}")
+                    logger.error("Error in state monitoring cycle: %s", e)
                 
-                # Wait for the specified interval before checking again
-                await asyncio.sleep(interval_seconds)
+                if received:
+                    if failures:
+                        logger.info("State checks recovered after %d failures", failures)
+                    failures = 0
+                    # Keep each cycle at least an interval long; a long-poll usually used it up waiting
+                    # server-side, but a server that answers at once must not get a tight loop
+                    remaining = interval_seconds - (time.monotonic() - started)
+                    if remaining > 0:
+                        await asyncio.sleep(remaining)
+                else:
+                    # Back off exponentially so an unreachable server isn't hit every interval
+                    delay = min(interval_seconds * 2 ** failures, MAX_RETRY_INTERVAL_SECONDS)
+                    failures += 1
+                    await asyncio.sleep(delay)
         except asyncio.CancelledError:
             logger.info("State monitoring cancelled")
             raise
         except Exception as e:
-            logger.error(f"Fatal error in state monitoring: {e}")
+            logger.error("Fatal error in state monitoring: %s", e)
             raise
\ No newline at end of file
@@ -1,6 +1,5 @@
 import os
 import sys
-import requests
 
 # Add the project root directory to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -8,7 +7,6 @@ sys.path.insert(0, project_root)
 
 import uuid
 import datetime
-import requests
 from flask import Flask, jsonify, send_from_directory, request, render_template
 from dash import Dash, html, dcc, Input, Output, State, ctx, clientside_callback
 import plotly.graph_objects as go
@@ -39,19 +37,21 @@ from web_app.lib.services.orm_service import (
     get_device_by_uuid,
     create_device,
     add_metrics_batch,
+    add_snapshots_batch,
     get_dropdown_options,
     get_filtered_metrics,
     get_visualization_data
 )
-from threading import Lock
+from threading import Lock, Condition
 import time
 from web_app.lib.services.ip_service import IPService
+from web_app.lib.utils.json_provider import OrjsonProvider
+from web_app.lib.utils.gzip_request import GzipRequestMiddleware
 import math
 import dash
 from dash import dcc, html, callback_context
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
-import json
 import threading
 from lib_utils.blocktimer import BlockTimer
 from web_app.lib.utils.metrics_cache import MetricsCache
@@ -73,6 +73,10 @@ ip_service = IPService()
 server = Flask(__name__)
 server.config['DEBUG'] = config.debug
 server.config['SECRET_KEY'] = config.server.secret_key
+# Parse metric uploads and encode API responses with orjson rather than the stdlib json module
+server.json = OrjsonProvider(server)
+# Clients gzip larger metric uploads
+server.wsgi_app = GzipRequestMiddleware(server.wsgi_app)
 
 # Initialize Dash app
 dash_app = Dash(
@@ -88,6 +92,10 @@ metrics_cache = MetricsCache(cache_duration_seconds=30)
 
 # State toggle system
 state_lock = Lock()
+# Signalled whenever the state is set to B, so long-polling /check-state requests wake immediately
+state_changed = Condition(state_lock)
+# Upper bound on how long a /check-state long-poll may hold the request open
+MAX_STATE_WAIT_SECONDS = 30
 # Initialize with current time to ensure it has a valid timestamp from the start
 current_time = datetime.datetime.now().isoformat()
 current_state = {
@@ -95,6 +103,8 @@ current_state = {
     "timestamp": current_time,     # When the state was last changed
     "last_toggle_time": current_time  # Track the last time the state was toggled
 }
+# Monotonic time of the last toggle, used for the 2 second toggle debounce
+last_toggle_monotonic = time.monotonic()
 
 
 # Define the Dash layout with routing
@@ -456,6 +466,14 @@ def add_metrics():
             "message": "Metrics added successfully"
         })
 
+    except ValueError as e:
+        # Unknown device; retrying the same snapshot would fail the same way
+        logger.error(f"Rejected metrics: {e}")
+        return jsonify({
+            "status": "ERROR",
+            "message": str(e)
+        }), HTTPStatusCode.BAD_REQUEST
+
     except Exception as e:
         logger.error(f"Error adding metrics: {e}")
         return jsonify({
@@ -463,12 +481,50 @@ def add_metrics():
             "message": str(e)
         }), HTTPStatusCode.INTERNAL_SERVER_ERROR
 
+@server.route("/metrics/batch", methods=["POST"])
+def add_metrics_batch_route():
+    """Add several metric snapshots in one request"""
+    try:
+        data = request.get_json()
+        snapshots = data.get('snapshots', [])
+
+        with get_db() as db:
+            add_snapshots_batch(db, snapshots)
+
+        return jsonify({
+            "status": "SUCCESS",
+            "message": f"Added {len(snapshots)} snapshots successfully"
+        })
+
+    except ValueError as e:
+        # Unknown device; retrying the same batch would fail the same way
+        logger.error(f"Rejected metrics batch: {e}")
+        return jsonify({
+            "status": "ERROR",
+            "message": str(e)
+        }), HTTPStatusCode.BAD_REQUEST
+
+    except Exception as e:
+        logger.error(f"Error adding metrics batch: {e}")
+        return jsonify({
+            "status": "ERROR",
+            "message": str(e)
+        }), HTTPStatusCode.INTERNAL_SERVER_ERROR
+
 @server.route("/check-state", methods=["GET"])
 def check_state():
-    """Check the current state and reset it to A if it's B"""
+    """Check the current state and reset it to A if it's B.
+
+    Clients may pass ?wait=<seconds> to long-poll: the request is held open
+    until the state becomes B or the wait elapses, instead of polling.
+    """
+    wait_seconds = min(request.args.get('wait', default=0, type=float), MAX_STATE_WAIT_SECONDS)
     with state_lock:
+        if wait_seconds > 0:
+            state_changed.wait_for(lambda: current_state["value"] == "B", timeout=wait_seconds)
+
         # Log the current state for debugging
-        logger.debug(f"Checking current state: {current_state}")
+        logger.debug("Checking current state: %s", current_state)
         
         # Get the current state value
         current_value = current_state["value"]
@@ -485,52 +541,63 @@ def check_state():
         # Return the original state (before reset)
         return jsonify(state_response)
 
+def set_state_b() -> dict:
+    """Set the state to B to trigger aggregator actions, unless the last toggle was under 2 seconds ago
+    
+    Returns:
+        dict: The toggle result, with status SUCCESS or WAIT
+    """
+    global last_toggle_monotonic
+    # Get the current time
+    current_time = datetime.datetime.now()
+    now = time.monotonic()
+    
+    with state_lock:
+        # Check if we need to enforce the delay, on the monotonic clock so wall-clock changes can't skew it
+        time_since_last_toggle = now - last_toggle_monotonic
+        
+        # If it's been less than 2 seconds, don't allow the toggle
+        if time_since_last_toggle < 2.0:
+            return {
+                "status": "WAIT",
+                "message": f"Please wait {2.0 - time_since_last_toggle:.1f} seconds before toggling again",
+                "state": current_state["value"],
+                "wait_time": 2.0 - time_since_last_toggle
+            }
+        
+        # Get the old state for logging
+        old_state = current_state["value"]
+        
+        # Always set to state B to trigger aggregator actions
+        # The check_state endpoint will reset it to A after it's been checked
+        new_state = "B"
+        current_state["value"] = new_state
+        
+        # Update timestamps
+        current_time_iso = current_time.isoformat()
+        current_state["timestamp"] = current_time_iso
+        current_state["last_toggle_time"] = current_time_iso
+        last_toggle_monotonic = now
+        
+        # Log the state change
+        logger.info(f"State manually set to B to trigger aggregator actions at {current_time_iso}")
+        
+        # Wake any aggregators long-polling /check-state
+        state_changed.notify_all()
+    
+    return {
+        "status": "SUCCESS",
+        "previous_state": old_state,
+        "new_state": new_state,
+        "message": "Aggregator action request sent",
+        "timestamp": current_time_iso
+    }
+
 @server.route("/toggle-state", methods=["POST"])
 def toggle_state():
     """Toggle the current state to trigger aggregator actions"""
     try:
-        # Get the current time
-        current_time = datetime.datetime.now()
-        
-        with state_lock:
-            # Check if we need to enforce the delay
-            if current_state["last_toggle_time"] is not None:
-                # Calculate the time since the last toggle
-                last_toggle = datetime.datetime.fromisoformat(current_state["last_toggle_time"])
-                time_since_last_toggle = (current_time - last_toggle).total_seconds()
-                
-                # If it's been less than 2 seconds, don't allow the toggle
-                if time_since_last_toggle < 2.0:
-                    return jsonify({
-                        "status": "WAIT",
-                        "message": f"Please wait {2.0 - time_since_last_toggle:.1f} seconds before toggling again",
-                        "state": current_state["value"],
-                        "wait_time": 2.0 - time_since_last_toggle
-                    })
-            
-            # Get the old state for logging
-            old_state = current_state["value"]
-            
-            # Always set to state B to trigger aggregator actions
-            # The check_state endpoint will reset it to A after it's been checked
-            new_state = "B"
-            current_state["value"] = new_state
-            
-            # Update timestamps
-            current_time_iso = current_time.isoformat()
-            current_state["timestamp"] = current_time_iso
-            current_state["last_toggle_time"] = current_time_iso
-            
-            # Log the state change
-            logger.info(f"State manually set to B to trigger aggregator actions at {current_time_iso}")
-        
-        return jsonify({
-            "status": "SUCCESS",
-            "previous_state": old_state,
-            "new_state": new_state,
-            "message": "Aggregator action request sent",
-            "timestamp": current_time_iso
-        })
+        return jsonify(set_state_b())
     except Exception as e:
         logger.error(f"Error toggling state: {e}")
         return jsonify({
@@ -560,9 +627,9 @@ def populate_dropdowns(_, n_clicks):
             # Use the orm_service function to get all dropdown options
             metric_options, aggregator_options, device_options = get_dropdown_options(db)
             
-            logger.info(f"Found {len(metric_options)} metric types")
-            logger.info(f"Found {len(aggregator_options)} aggregators")
-            logger.info(f"Found {len(device_options)} devices")
+            logger.info("Found %d metric types", len(metric_options))
+            logger.info("Found %d aggregators", len(aggregator_options))
+            logger.info("Found %d devices", len(device_options))
             
             return metric_options, aggregator_options, device_options
     except Exception as e:
@@ -613,7 +680,7 @@ def update_visualizations(metric_type_id, start_date, end_date, min_value, max_v
         if cached_result is not None:
             cached_data, age = cached_result
             
-            logger.info(f"Using cached data (age: {age:.1f}s)")
+            logger.info("Using cached data (age: %.1fs)", age)
             
             # Unpack the cached data
             gauge, history, table, pagination_info, total_pages, original_update_time = cached_data
@@ -644,8 +711,8 @@ def update_visualizations(metric_type_id, start_date, end_date, min_value, max_v
             if rows_per_page is None:
                 rows_per_page = 20
                 
-            logger.info(f"Fetching page {page_number} with {rows_per_page} rows per page")
-            logger.info(f"Filters: metric_type={metric_type_id}, aggregator={aggregator_id}, device={device_id}")
+            logger.info("Fetching page %s with %s rows per page", page_number, rows_per_page)
+            logger.info("Filters: metric_type=%s, aggregator=%s, device=%s", metric_type_id, aggregator_id, device_id)
             
             with get_db() as db:
                 # Use the orm_service function to get filtered metrics
@@ -663,7 +730,7 @@ def update_visualizations(metric_type_id, start_date, end_date, min_value, max_v
                     rows_per_page=rows_per_page
                 )
                 
-                logger.info(f"Fetched {len(results)} records for current page")
+                logger.info("Fetched %d records for current page", len(results))
                 
                 # Convert to list of dicts
                 data = [{
@@ -704,15 +771,17 @@ def update_visualizations(metric_type_id, start_date, end_date, min_value, max_v
                     return error_result
                 
                 # Create table with formatted timestamps
-                df_display = df.copy()
+                # Dropping the hidden column already yields a new frame, so no separate full copy is needed
+                df_display = df.drop(columns='metric_type_id')
                 df_display['timestamp'] = df_display['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
                 df_display['value'] = df_display['value'].round(4)
-                df_display = df_display.drop('metric_type_id', axis=1)
-                table = html.Table(
-                    [html.Tr([html.Th(col) for col in df_display.columns])] +
-                    [html.Tr([html.Td(df_display.iloc[i][col]) for col in df_display.columns])
-                     for i in range(len(df_display))]
-                )
+                # Build the rows straight into one list from a row iterator, instead of
+                # indexing every cell with iloc and concatenating two lists
+                table = html.Table([
+                    html.Tr([html.Th(col) for col in df_display.columns]),
+                    *(html.Tr([html.Td(value) for value in row])
+                      for row in df_display.itertuples(index=False, name=None))
+                ])
                 
                 # Get the current time for the last update timestamp
                 end_time = datetime.datetime.now()
@@ -927,117 +996,72 @@ def handle_toggle_button(n_clicks):
         # Always disable the button immediately when clicked
         # This prevents rapid clicking and provides immediate visual feedback
         try:
-            # Toggle the state to trigger aggregator actions
-            # Use request.url_root to get the base URL of the current server
-            toggle_response = requests.post(f"{request.url_root}toggle-state")
+            # Toggle the state in-process rather than POSTing to our own /toggle-state endpoint
+            response_data = set_state_b()
             
-            if toggle_response.status_code == 200:
-                response_data = toggle_response.json()
+            # If we get a success response, show the success notification
+            if response_data.get("status") == "SUCCESS":
+                # Create a prettier notification about the aggregator actions
+                notification = html.Div([
+                    html.Div([
+                        html.I(className="fas fa-cogs", style={
+                            "font-size": "24px",
+                            "margin-right": "10px",
+                            "color": "#4CAF50"
+                        }),
+                        html.Span("Action Request Sent", style={
+                            "font-weight": "bold",
+                            "font-size": "18px"
+                        })
+                    ], style={"display": "flex", "align-items": "center", "margin-bottom": "10px"}),
+                    html.P("The action request has been sent to connected aggregators.", 
+                           style={"margin-bottom": "15px", "color": "#555"}),
+                    html.Button([
+                        html.I(className="fas fa-times", style={"margin-right": "5px"}),
+                        "Close"
+                    ], id="close-notification", className="btn btn-sm btn-outline-secondary")
+                ], style={"padding": "15px"})
                 
-                # If we get a success response, show the success notification
-                if response_data.get("status") == "SUCCESS":
-                    # Create a prettier notification about the aggregator actions
-                    notification = html.Div([
-                        html.Div([
-                            html.I(className="fas fa-cogs", style={
-                                "font-size": "24px",
-                                "margin-right": "10px",
-                                "color": "#4CAF50"
-                            }),
-                            html.Span("Action Request Sent", style={
-                                "font-weight": "bold",
-                                "font-size": "18px"
-                            })
-                        ], style={"display": "flex", "align-items": "center", "margin-bottom": "10px"}),
-                        html.P("The action request has been sent to connected aggregators.", 
-                               style={"margin-bottom": "15px", "color": "#555"}),
-                        html.Button([
-                            html.I(className="fas fa-times", style={"margin-right": "5px"}),
-                            "Close"
-                        ], id="close-notification", className="btn btn-sm btn-outline-secondary")
-                    ], style={"padding": "15px"})
-                    
-                    # Return the notification with improved styling
-                    notification_style = {
-                        'display': 'block',
-                        'position': 'fixed',
-                        'top': '20px',
-                        'right': '20px',
-                        'padding': '0',
-                        'background-color': 'white',
-                        'color': '#333',
-                        'border-radius': '8px',
-                        'box-shadow': '0 4px 12px rgba(0,0,0,0.15)',
-                        'z-index': '1000',
-                        'min-width': '300px',
-                        'max-width': '400px',
-                        'border-left': '4px solid #4CAF50',
-                        'transition': 'opacity 0.3s ease-out, transform 0.3s ease-out'
-                    }
-                    
-                    return notification, notification_style, True
-                # If we get a WAIT response, just disable the button without showing any notification
-                elif response_data.get("status") == "WAIT":
-                    # Just disable the button without showing an error notification
-                    return dash.no_update, {'display': 'none'}, True
-                # For other errors, show an error notification but still disable the button
-                else:
-                    # Handle error in toggle request with prettier styling
-                    error_message = response_data.get('message', 'Unknown error')
-                    notification = html.Div([
-                        html.Div([
-                            html.I(className="fas fa-exclamation-triangle", style={
-                                "font-size": "24px",
-                                "margin-right": "10px",
-                                "color": "#f44336"
-                            }),
-                            html.Span("Error", style={
-                                "font-weight": "bold",
-                                "font-size": "18px"
-                            })
-                        ], style={"display": "flex", "align-items": "center", "margin-bottom": "10px"}),
-                        html.P(f"Error sending action request: {error_message}", 
-                               style={"margin-bottom": "15px", "color": "#555"}),
-                        html.Button([
-                            html.I(className="fas fa-times", style={"margin-right": "5px"}),
-                            "Close"
-                        ], id="close-notification", className="btn btn-sm btn-outline-secondary")
-                    ], style={"padding": "15px"})
-                    
-                    # Return the error notification with improved styling
-                    error_style = {
-                        'display': 'block',
-                        'position': 'fixed',
-                        'top': '20px',
-                        'right': '20px',
-                        'padding': '0',
-                        'background-color': 'white',
-                        'color': '#333',
-                        'border-radius': '8px',
-                        'box-shadow': '0 4px 12px rgba(0,0,0,0.15)',
-                        'z-index': '1000',
-                        'min-width': '300px',
-                        'max-width': '400px',
-                        'border-left': '4px solid #f44336',
-                        'transition': 'opacity 0.3s ease-out, transform 0.3s ease-out'
-                    }
-                    
-                    return notification, error_style, True
+                # Return the notification with improved styling
+                notification_style = {
+                    'display': 'block',
+                    'position': 'fixed',
+                    'top': '20px',
+                    'right': '20px',
+                    'padding': '0',
+                    'background-color': 'white',
+                    'color': '#333',
+                    'border-radius': '8px',
+                    'box-shadow': '0 4px 12px rgba(0,0,0,0.15)',
+                    'z-index': '1000',
+                    'min-width': '300px',
+                    'max-width': '400px',
+                    'border-left': '4px solid #4CAF50',
+                    'transition': 'opacity 0.3s ease-out, transform 0.3s ease-out'
+                }
+                
+                return notification, notification_style, True
+            # If we get a WAIT response, just disable the button without showing any notification
+            elif response_data.get("status") == "WAIT":
+                # Just disable the button without showing an error notification
+                return dash.no_update, {'display': 'none'}, True
+            # For other errors, show an error notification but still disable the button
             else:
-                # Handle HTTP error with prettier styling
+                # Handle error in toggle request with prettier styling
+                error_message = response_data.get('message', 'Unknown error')
                 notification = html.Div([
                     html.Div([
-                        html.I(className="fas fa-exclamation-circle", style={
+                        html.I(className="fas fa-exclamation-triangle", style={
                             "font-size": "24px",
                             "margin-right": "10px",
-                            "color": "#ff9800"
+                            "color": "#f44336"
                         }),
-                        html.Span("HTTP Error", style={
+                        html.Span("Error", style={
                             "font-weight": "bold",
                             "font-size": "18px"
                         })
                     ], style={"display": "flex", "align-items": "center", "margin-bottom": "10px"}),
-                    html.P(f"Error: HTTP {toggle_response.status_code}", 
+                    html.P(f"Error sending action request: {error_message}", 
                            style={"margin-bottom": "15px", "color": "#555"}),
                     html.Button([
                         html.I(className="fas fa-times", style={"margin-right": "5px"}),
@@ -1045,8 +1069,8 @@ def handle_toggle_button(n_clicks):
                     ], id="close-notification", className="btn btn-sm btn-outline-secondary")
                 ], style={"padding": "15px"})
                 
-                # Return the HTTP error notification with improved styling
-                http_error_style = {
+                # Return the error notification with improved styling
+                error_style = {
                     'display': 'block',
                     'position': 'fixed',
                     'top': '20px',
@@ -1059,11 +1083,11 @@ def handle_toggle_button(n_clicks):
                     'z-index': '1000',
                     'min-width': '300px',
                     'max-width': '400px',
-                    'border-left': '4px solid #ff9800',
+                    'border-left': '4px solid #f44336',
                     'transition': 'opacity 0.3s ease-out, transform 0.3s ease-out'
                 }
                 
-                return notification, http_error_style, True
+                return notification, error_style, True
         except Exception as e:
             # Handle any other exceptions with prettier styling
             notification = html.Div([
@@ -1121,19 +1145,23 @@ def close_notification(n_clicks):
         return {'display': 'none'}
     return dash.no_update
 
-# Add callback to re-enable the button after 2 seconds
-@dash_app.callback(
+# Re-enable the button after 2 seconds. The delay runs as a timer in the browser
+# rather than parking a server worker thread in time.sleep for every click.
+clientside_callback(
+    """
+    function(disabled) {
+        if (!disabled) {
+            return window.dash_clientside.no_update;
+        }
+        return new Promise(function(resolve) {
+            setTimeout(function() { resolve(false); }, 2000);
+        });
+    }
+    """,
     Output('toggle-button', 'disabled', allow_duplicate=True),
     Input('toggle-button', 'disabled'),
     prevent_initial_call=True
 )
-def enable_button_after_delay(disabled):
-    """Re-enable the button after a 2-second delay"""
-    if disabled:
-        # Use a fixed delay of 2 seconds to ensure the button is disabled long enough
-        time.sleep(2)
-        return False
-    return dash.no_update
 
 if __name__ == '__main__':
     try:
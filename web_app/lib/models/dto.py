@@ -1,4 +1,4 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator
 from typing import List, Optional, Dict
 from datetime import datetime
 from decimal import Decimal
@@ -18,7 +18,8 @@ class AggregatorDTO(BaseModel):
     name: str
     aggregator_uuid: Optional[str] = None
 
-    @validator('aggregator_uuid')
+    @field_validator('aggregator_uuid')
+    @classmethod
     def normalize_aggregator_uuid(cls, v):
         return normalize_uuid(v)
 
@@ -28,7 +29,8 @@ class DeviceDTO(BaseModel):
     device_uuid: Optional[str] = None
     aggregator_uuid: str
 
-    @validator('device_uuid', 'aggregator_uuid')
+    @field_validator('device_uuid', 'aggregator_uuid')
+    @classmethod
     def normalize_device_uuids(cls, v):
         return normalize_uuid(v)
 
@@ -37,7 +39,8 @@ class MetricTypeDTO(BaseModel):
     metric_type_name: str
     device_uuid: str
 
-    @validator('device_uuid')
+    @field_validator('device_uuid')
+    @classmethod
     def normalize_device_uuid(cls, v):
         return normalize_uuid(v)
 
@@ -53,7 +56,8 @@ class MetricSnapshotDTO(BaseModel):
     client_timezone_minutes: int
     metric_values: List[MetricValueDTO]
 
-    @validator('device_uuid')
+    @field_validator('device_uuid')
+    @classmethod
     def normalize_device_uuid(cls, v):
         return normalize_uuid(v)
 
@@ -1,21 +1,26 @@
-import requests
 import logging
 from typing import Dict, Optional
-from datetime import datetime, timedelta
+import time
 import threading
+import orjson
+from ..utils.http_session import get_session
 
 logger = logging.getLogger(__name__)
 
+# Lookups run inside page requests, so a slow lookup API must not hold the request up for long
+LOOKUP_TIMEOUT_SECONDS = (3, 5)  # (connect, read)
+
 class IPService:
     def __init__(self):
         self.api_url = "http://ip-api.com/json/{}"
-        self._cache = {}  # {ip: (location_data, timestamp)}
+        self._cache = {}  # {ip: (location_data, monotonic timestamp)}
         self._cache_lock = threading.Lock()
-        self._cache_ttl = timedelta(hours=24)  # Cache for 24 hours
+        self._cache_ttl = 24 * 60 * 60  # Cache for 24 hours (seconds)
+        self._session = get_session()  # Reuse connections to the lookup API across requests
         
-    def _is_cache_valid(self, timestamp: datetime) -> bool:
+    def _is_cache_valid(self, timestamp: float) -> bool:
         """Check if cached data is still valid"""
-        return datetime.utcnow() - timestamp < self._cache_ttl
+        return time.monotonic() - timestamp < self._cache_ttl
         
     def get_location(self, ip_address: str) -> Optional[Dict[str, str]]:
         """Get location information for an IP address with caching
@@ -43,12 +48,12 @@ class IPService:
                     'country': 'Machine'
                 }
                 with self._cache_lock:
-                    self._cache[ip_address] = (location, datetime.utcnow())
+                    self._cache[ip_address] = (location, time.monotonic())
                 return location
             
-            response = requests.get(self.api_url.format(ip_address))
+            response = self._session.get(self.api_url.format(ip_address), timeout=LOOKUP_TIMEOUT_SECONDS)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['status'] == 'success':
                     location = {
                         'city': data['city'],
@@ -57,7 +62,7 @@ class IPService:
                     }
                     # Cache the result
                     with self._cache_lock:
-                        self._cache[ip_address] = (location, datetime.utcnow())
+                        self._cache[ip_address] = (location, time.monotonic())
                     return location
                 else:
                     logger.warning(f"IP lookup failed for {ip_address}: {data['message']}")
@@ -1,11 +1,12 @@
 from sqlalchemy import select, func, and_, desc
 from sqlalchemy.orm import Session
 from ..models.generated_models import Devices, MetricTypes, MetricSnapshots, MetricValues, Visits, Aggregators
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime, timezone, timedelta
 import pandas as pd
 import math
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,29 @@ def get_all_metric_types(db: Session) -> List[Dict[str, Any]]:
         'metric_count': metric_count
     } for type, metric_count in types]
 
+@lru_cache(maxsize=1024)
+def _convert_timestamp(client_timestamp_str: str, client_offset: int, server_offset: int) -> str:
+    """Convert client timestamp to server local time
+    
+    Cached because every value row of a snapshot shares its timestamp, and the same
+    recent snapshots are listed again on each dashboard refresh.
+    """
+    try:
+        # Parse the client timestamp; only a trailing Z needs rewriting for fromisoformat
+        if client_timestamp_str.endswith('Z'):
+            client_time = datetime.fromisoformat(client_timestamp_str[:-1] + '+00:00')
+        else:
+            # Add client offset to get UTC (if timestamp wasn't already UTC)
+            client_time = datetime.fromisoformat(client_timestamp_str) + timedelta(minutes=client_offset)
+        
+        # Subtract server offset to get server local time
+        server_time = client_time - timedelta(minutes=server_offset)
+        
+        return server_time.isoformat()
+    except Exception as e:
+        logger.error(f"Error converting timestamp {client_timestamp_str}: {e}")
+        return client_timestamp_str
+
 def get_recent_metrics(db: Session, limit: int = 100) -> List[Dict[str, Any]]:
     """Get recent metrics with their types and devices"""
     metrics = (
@@ -79,30 +103,12 @@ def get_recent_metrics(db: Session, limit: int = 100) -> List[Dict[str, Any]]:
         .all()
     )
     
-    def convert_timestamp(client_timestamp_str: str, client_offset: int, server_offset: int) -> str:
-        """Convert client timestamp to server local time"""
-        try:
-            # Parse the client timestamp
-            client_time = datetime.fromisoformat(client_timestamp_str.replace('Z', '+00:00'))
-            
-            # Add client offset to get UTC (if timestamp wasn't already UTC)
-            if not client_timestamp_str.endswith('Z'):
-                client_time = client_time + timedelta(minutes=client_offset)
-            
-            # Subtract server offset to get server local time
-            server_time = client_time - timedelta(minutes=server_offset)
-            
-            return server_time.isoformat()
-        except Exception as e:
-            logger.error(f"Error converting timestamp {client_timestamp_str}: {e}")
-            return client_timestamp_str
-    
     return [{
         'device_uuid': device.device_uuid,
         'device_name': device.device_name,
         'metric_type': type.metric_type_name,
         'value': float(value.value),
-        'timestamp': convert_timestamp(
+        'timestamp': _convert_timestamp(
             snapshot.client_timestamp_utc,
             snapshot.client_timezone_minutes,
             snapshot.server_timezone_minutes
@@ -304,7 +310,8 @@ def create_device(db: Session, device_uuid: str, device_name: str, aggregator_id
     return device
 
 def create_metric_snapshot(db: Session, device_id: int, client_timestamp: str, 
-                          client_timezone: int, server_timezone: int) -> MetricSnapshots:
+                          client_timezone: int, server_timezone: int,
+                          server_timestamp: Optional[datetime] = None) -> MetricSnapshots:
     """Create a new metric snapshot
     
     Args:
@@ -313,6 +320,7 @@ def create_metric_snapshot(db: Session, device_id: int, client_timestamp: str,
         client_timestamp (str): Client timestamp
         client_timezone (int): Client timezone offset in minutes
         server_timezone (int): Server timezone offset in minutes
+        server_timestamp (Optional[datetime]): Server receive time in UTC (defaults to now)
         
     Returns:
         MetricSnapshots: Created snapshot record
@@ -321,7 +329,7 @@ def create_metric_snapshot(db: Session, device_id: int, client_timestamp: str,
         device_id=device_id,
         client_timestamp_utc=client_timestamp,
         client_timezone_minutes=client_timezone,
-        server_timestamp_utc=datetime.utcnow(),
+        server_timestamp_utc=server_timestamp or datetime.utcnow(),
         server_timezone_minutes=server_timezone
     )
     db.add(snapshot)
@@ -383,6 +391,41 @@ def add_or_update_metric_value(db: Session, snapshot_id: int, metric_type_id: in
         db.add(value_record)
         return value_record
 
+def _add_snapshot(db: Session, device_uuid: str, client_timestamp: str,
+                  client_timezone: int, metrics: List[Dict], server_timezone: float,
+                  server_timestamp: datetime, devices: Dict[str, Devices],
+                  metric_type_ids: Dict[str, int]) -> None:
+    """Stage one snapshot and its metric values in the session without committing
+    
+    devices and metric_type_ids memoize lookups across the snapshots of one request.
+    """
+    # Get device
+    device = devices.get(device_uuid)
+    if device is None:
+        device = get_device_by_uuid(db, device_uuid)
+        if not device:
+            raise ValueError(f"Device not found: {device_uuid}")
+        devices[device_uuid] = device
+
+    # Create snapshot
+    snapshot = create_metric_snapshot(db, device.device_id, client_timestamp, 
+                                     client_timezone, server_timezone, server_timestamp)
+
+    # The snapshot is new, so it has no stored values to update: collapse repeated types
+    # in the request (last value wins, as add_or_update_metric_value would) and insert directly
+    values: Dict[int, float] = {}
+    for metric in metrics:
+        metric_type_id = metric_type_ids.get(metric['type'])
+        if metric_type_id is None:
+            metric_type_id = get_or_create_metric_type(db, device.device_id, metric['type']).metric_type_id
+            metric_type_ids[metric['type']] = metric_type_id
+        values[metric_type_id] = metric['value']
+
+    db.add_all([
+        MetricValues(metric_snapshot_id=snapshot.metric_snapshot_id, metric_type_id=metric_type_id, value=value)
+        for metric_type_id, value in values.items()
+    ])
+
 def add_metrics_batch(db: Session, device_uuid: str, client_timestamp: str, 
                      client_timezone: int, metrics: List[Dict]) -> None:
     """Add a batch of metrics for a device
@@ -395,21 +438,39 @@ def add_metrics_batch(db: Session, device_uuid: str, client_timestamp: str,
         metrics (List[Dict]): List of metrics to add
     """
     try:
-        # Get device
-        device = get_device_by_uuid(db, device_uuid)
-        if not device:
-            raise ValueError(f"Device not found: {device_uuid}")
-
-        # Create snapshot
         server_timezone = -datetime.now().astimezone().utcoffset().total_seconds() // 60
-        snapshot = create_metric_snapshot(db, device.device_id, client_timestamp, 
-                                         client_timezone, server_timezone)
-
-        # Add metric values
-        for metric in metrics:
-            metric_type = get_or_create_metric_type(db, device.device_id, metric['type'])
-            add_or_update_metric_value(db, snapshot.metric_snapshot_id, metric_type.metric_type_id, metric['value'])
+        _add_snapshot(db, device_uuid, client_timestamp, client_timezone, metrics,
+                      server_timezone, datetime.utcnow(), {}, {})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
 
+def add_snapshots_batch(db: Session, snapshots: List[Dict]) -> None:
+    """Add several metric snapshots, possibly from different devices, in one transaction
+    
+    Args:
+        db (Session): Database session
+        snapshots (List[Dict]): Snapshots in the /metrics request format
+    """
+    try:
+        # Every snapshot in the request is received at the same moment, so take the clock once
+        server_timestamp = datetime.utcnow()
+        server_timezone = -datetime.now().astimezone().utcoffset().total_seconds() // 60
+        devices: Dict[str, Devices] = {}
+        metric_type_ids: Dict[str, int] = {}
+        for snapshot in snapshots:
+            _add_snapshot(
+                db,
+                snapshot.get('device_uuid'),
+                snapshot.get('client_timestamp'),
+                snapshot.get('client_timezone_minutes', 0),  # Default to UTC if not provided
+                snapshot.get('metrics', []),
+                server_timezone,
+                server_timestamp,
+                devices,
+                metric_type_ids
+            )
         db.commit()
     except Exception as e:
         db.rollback()
@@ -0,0 +1,50 @@
+import io
+import zlib
+
+# Refuse request bodies that inflate beyond this, so a small upload can't exhaust memory
+MAX_DECOMPRESSED_BYTES = 16 * 1024 * 1024
+
+class GzipRequestMiddleware:
+    """WSGI middleware that inflates request bodies sent with Content-Encoding: gzip"""
+
+    def __init__(self, app, max_size: int = MAX_DECOMPRESSED_BYTES):
+        self.app = app
+        self.max_size = max_size
+
+    def __call__(self, environ, start_response):
+        if environ.get('HTTP_CONTENT_ENCODING', '').lower() != 'gzip':
+            return self.app(environ, start_response)
+
+        if not environ.get('CONTENT_LENGTH'):
+            # A chunked upload has no length to read; without one the body would inflate to nothing
+            return self._reject(start_response, '411 Length Required', b'Content-Length required for gzip body')
+
+        try:
+            length = int(environ['CONTENT_LENGTH'])
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._reject(start_response, '400 Bad Request', b'Invalid Content-Length')
+
+        try:
+            # wbits=31 expects a gzip header and trailer
+            decompressor = zlib.decompressobj(wbits=31)
+            body = decompressor.decompress(environ['wsgi.input'].read(length), self.max_size)
+            if decompressor.unconsumed_tail:
+                return self._reject(start_response, '413 Request Entity Too Large', b'Decompressed body too large')
+            if not decompressor.eof:
+                # The stream ended before the gzip trailer, so what was inflated is only part of the body
+                return self._reject(start_response, '400 Bad Request', b'Truncated gzip body')
+        except zlib.error:
+            return self._reject(start_response, '400 Bad Request', b'Invalid gzip body')
+
+        # Downstream sees a plain body, as if it had been sent uncompressed
+        environ['wsgi.input'] = io.BytesIO(body)
+        environ['CONTENT_LENGTH'] = str(len(body))
+        del environ['HTTP_CONTENT_ENCODING']
+        return self.app(environ, start_response)
+
+    @staticmethod
+    def _reject(start_response, status: str, message: bytes):
+        start_response(status, [('Content-Type', 'text/plain'), ('Content-Length', str(len(message)))])
+        return [message]
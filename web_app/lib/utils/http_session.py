@@ -0,0 +1,21 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional
+
+# One pooled session for the server's outbound HTTP calls, so keep-alive connections are reused
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Get the process-wide outbound HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
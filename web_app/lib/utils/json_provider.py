@@ -0,0 +1,23 @@
+import orjson
+from decimal import Decimal
+from flask.json.provider import JSONProvider
+
+def _default(obj):
+    """orjson fallback for the types Flask's default provider also handles"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used for request parsing and jsonify responses"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=_default), mimetype="application/json")
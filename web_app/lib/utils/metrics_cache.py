@@ -2,7 +2,7 @@ import time
 import threading
 import logging
 import hashlib
-import json
+import orjson
 from typing import Dict, Any, Tuple, Optional
 from contextlib import contextmanager
 
@@ -36,7 +36,7 @@ class MetricsCache:
         try:
             # Check if lock is stuck
             if self.lock_owner is not None:
-                current_time = time.time()
+                current_time = time.monotonic()
                 if current_time - self.lock_acquire_time > self.max_lock_time:
                     logger.warning(f"Lock held by thread {self.lock_owner} for > {self.max_lock_time}s. Forcing release.")
                     # Force release the lock
@@ -48,7 +48,7 @@ class MetricsCache:
             self.cache_lock.acquire()
             # Track lock ownership
             self.lock_owner = threading.current_thread().ident
-            self.lock_acquire_time = time.time()
+            self.lock_acquire_time = time.monotonic()
             
             yield
             
@@ -74,11 +74,11 @@ class MetricsCache:
         if 'n_clicks' in filter_params:
             del filter_params['n_clicks']
             
-        # Convert parameters to a sorted string representation
-        param_str = json.dumps(filter_params, sort_keys=True)
+        # Serialize with sorted keys; orjson yields bytes, ready for hashing without re-encoding
+        param_bytes = orjson.dumps(filter_params, option=orjson.OPT_SORT_KEYS)
         
         # Create a hash of the parameters
-        return hashlib.md5(param_str.encode()).hexdigest()
+        return hashlib.md5(param_bytes).hexdigest()
     
     def get_cached_data(self, **filter_params) -> Optional[Tuple[Any, float]]:
         """
@@ -95,17 +95,17 @@ class MetricsCache:
         with self.safe_lock():
             if cache_key in self.cache:
                 timestamp, data = self.cache[cache_key]
-                current_time = time.time()
+                current_time = time.monotonic()
                 age = current_time - timestamp
                 
                 # Check if cache is still valid
                 if age < self.cache_duration:
-                    logger.info(f"Cache hit for key {cache_key[:8]}... (age: {age:.1f}s)")
+                    logger.info("Cache hit for key %.8s... (age: %.1fs)", cache_key, age)
                     return data, age
                 else:
-                    logger.info(f"Cache expired for key {cache_key[:8]}... (age: {age:.1f}s)")
+                    logger.info("Cache expired for key %.8s... (age: %.1fs)", cache_key, age)
             else:
-                logger.info(f"Cache miss for key {cache_key[:8]}...")
+                logger.info("Cache miss for key %.8s...", cache_key)
                 
         return None
     
@@ -120,8 +120,8 @@ class MetricsCache:
         cache_key = self._generate_cache_key(**filter_params)
         
         with self.safe_lock():
-            self.cache[cache_key] = (time.time(), data)
-            logger.info(f"Updated cache for key {cache_key[:8]}...")
+            self.cache[cache_key] = (time.monotonic(), data)
+            logger.info("Updated cache for key %.8s...", cache_key)
     
     def invalidate_cache(self, **filter_params) -> None:
         """
@@ -135,7 +135,7 @@ class MetricsCache:
         with self.safe_lock():
             if cache_key in self.cache:
                 del self.cache[cache_key]
-                logger.info(f"Invalidated cache for key {cache_key[:8]}...")
+                logger.info("Invalidated cache for key %.8s...", cache_key)
     
     def invalidate_all(self) -> None:
         """Invalidate all cached data."""